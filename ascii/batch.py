@@ -0,0 +1,505 @@
+import sys
+import os
+import io
+import time
+import hashlib
+from collections import OrderedDict
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger.logger import logger
+from PIL import Image
+import numpy as np
+
+from generator import ASCIIGenerator, REMBG_AVAILABLE, composite_on_black
+from writers import open_writer
+
+# Import conditionnel pour les sessions rembg
+if REMBG_AVAILABLE:
+    from rembg import new_session
+
+class BatchBackgroundRemover:
+    """
+    Suppression d'arrière-plan par lots.
+    
+    Les images sont mises au format d'entrée du modèle sans déformation
+    (letterbox), empilées et envoyées en un seul appel à la session ONNX,
+    puis les masques sont découpés et composés sur fond noir comme le fait
+    ASCIIGenerator.remove_background.
+    """
+    
+    # Normalisation (moyenne, écart-type) et taille d'entrée par défaut des modèles
+    # rembg dont la sortie est un masque unique ; la taille réelle est lue sur le modèle
+    MODEL_PARAMETERS = {
+        'u2net': ((0.485, 0.456, 0.406), (0.229, 0.224, 0.225), 320),
+        'u2netp': ((0.485, 0.456, 0.406), (0.229, 0.224, 0.225), 320),
+        'u2net_human_seg': ((0.485, 0.456, 0.406), (0.229, 0.224, 0.225), 320),
+        'silueta': ((0.485, 0.456, 0.406), (0.229, 0.224, 0.225), 320),
+        'isnet-general-use': ((0.485, 0.456, 0.406), (1.0, 1.0, 1.0), 1024),
+        'isnet-anime': ((0.485, 0.456, 0.406), (1.0, 1.0, 1.0), 1024)
+    }
+    
+    def __init__(self, model_name='u2net', batch_size=8, providers=None):
+        """
+        Initialise le détoureur par lots.
+        
+        Args:
+            model_name (str): Nom du modèle rembg (voir MODEL_PARAMETERS)
+            batch_size (int): Nombre d'images par appel au modèle
+            providers (list): Fournisseurs ONNX Runtime (ex: ['CPUExecutionProvider'])
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size doit être supérieur ou égal à 1")
+        if model_name not in self.MODEL_PARAMETERS:
+            raise ValueError(f"Modèle non supporté par le traitement par lots: {model_name} "
+                             f"(modèles supportés: {', '.join(self.MODEL_PARAMETERS)})")
+        
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.providers = providers
+        self.mean, self.std, default_size = self.MODEL_PARAMETERS[model_name]
+        # Taille d'entrée (largeur, hauteur), confirmée au chargement du modèle
+        self.input_size = (default_size, default_size)
+        self._session = None
+        
+        logger.info(f"Détoureur par lots initialisé (modèle '{model_name}', lots de {batch_size})")
+    
+    def _get_session(self):
+        """Crée la session rembg à la première utilisation et limite la taille des lots au modèle."""
+        if self._session is None:
+            logger.info(f"Chargement du modèle {self.model_name}...")
+            if self.providers is not None:
+                self._session = new_session(self.model_name, providers=self.providers)
+            else:
+                self._session = new_session(self.model_name)
+            
+            # Forme d'entrée NxCxHxW : certains modèles exportés ont une dimension
+            # de lot fixe, et la taille d'image fixée par le modèle prime sur la valeur par défaut
+            model_batch, _, model_height, model_width = self._session.inner_session.get_inputs()[0].shape
+            if isinstance(model_batch, int) and model_batch < self.batch_size:
+                logger.warning(f"Le modèle n'accepte que des lots de {model_batch} image(s)")
+                self.batch_size = model_batch
+            if isinstance(model_width, int) and isinstance(model_height, int):
+                self.input_size = (model_width, model_height)
+            logger.debug(f"Taille d'entrée du modèle: {self.input_size[0]}x{self.input_size[1]}")
+        return self._session
+    
+    def _letterbox(self, image):
+        """
+        Redimensionne l'image dans l'entrée du modèle en conservant les
+        proportions et normalise les pixels.
+        
+        Args:
+            image (PIL.Image): Image source
+        
+        Returns:
+            tuple: (tableau float32 CxHxW, boîte (x, y, largeur, hauteur) de l'image utile)
+        """
+        input_width, input_height = self.input_size
+        scale = min(input_width / image.width, input_height / image.height)
+        new_width = max(1, min(input_width, round(image.width * scale)))
+        new_height = max(1, min(input_height, round(image.height * scale)))
+        
+        resized = image.convert('RGB').resize((new_width, new_height), Image.Resampling.LANCZOS)
+        
+        # Image centrée sur un fond noir
+        canvas = np.zeros((input_height, input_width, 3), dtype=np.float32)
+        x = (input_width - new_width) // 2
+        y = (input_height - new_height) // 2
+        canvas[y:y + new_height, x:x + new_width] = np.asarray(resized, dtype=np.float32)
+        
+        # Même normalisation que rembg (division par le maximum puis moyenne/écart-type)
+        canvas /= max(float(canvas.max()), 1e-6)
+        canvas -= np.array(self.mean, dtype=np.float32)
+        canvas /= np.array(self.std, dtype=np.float32)
+        
+        return canvas.transpose((2, 0, 1)), (x, y, new_width, new_height)
+    
+    def _predict_masks(self, images):
+        """
+        Calcule les masques d'un lot d'images en un seul appel au modèle.
+        
+        Args:
+            images (list): Images PIL du lot
+        
+        Returns:
+            list: Masques PIL en mode 'L', à la taille de chaque image
+        """
+        session = self._get_session()
+        inner_session = session.inner_session
+        
+        inputs, boxes = zip(*(self._letterbox(image) for image in images))
+        batch = np.stack(inputs)
+        
+        outputs = inner_session.run(None, {inner_session.get_inputs()[0].name: batch})
+        predictions = outputs[0][:, 0, :, :]
+        
+        masks = []
+        for image, prediction, (x, y, width, height) in zip(images, predictions, boxes):
+            # Retirer les bandes de letterbox avant la normalisation min/max
+            prediction = prediction[y:y + height, x:x + width]
+            minimum, maximum = prediction.min(), prediction.max()
+            prediction = (prediction - minimum) / max(maximum - minimum, 1e-6)
+            
+            mask = Image.fromarray((prediction * 255).astype(np.uint8), mode='L')
+            masks.append(mask.resize(image.size, Image.Resampling.LANCZOS))
+        return masks
+    
+    def remove_backgrounds(self, images):
+        """
+        Supprime l'arrière-plan d'une liste d'images par lots.
+        
+        Args:
+            images (list): Images PIL sources
+        
+        Returns:
+            list: Images sans arrière-plan sur fond noir, dans le même ordre
+                  (image originale si rembg est indisponible ou en cas d'erreur)
+        """
+        images = list(images)
+        if not REMBG_AVAILABLE:
+            logger.warning("rembg non disponible - Suppression d'arrière-plan ignorée")
+            return images
+        
+        # Session chargée avant le découpage : elle peut réduire la taille des lots
+        try:
+            self._get_session()
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement du modèle {self.model_name}: {e}")
+            logger.info("Utilisation des images originales")
+            return images
+        
+        results = []
+        for start in range(0, len(images), self.batch_size):
+            chunk = images[start:start + self.batch_size]
+            try:
+                masks = self._predict_masks(chunk)
+            except Exception as e:
+                logger.error(f"Erreur lors de la suppression d'arrière-plan par lot: {e}")
+                logger.info("Utilisation des images originales pour ce lot")
+                results.extend(chunk)
+                continue
+            
+            for image, mask in zip(chunk, masks):
+                # Découpe identique à rembg, puis fond noir comme remove_background
+                rgba = image.convert('RGBA')
+                cutout = Image.composite(rgba, Image.new('RGBA', image.size, 0), mask)
+                results.append(composite_on_black(cutout))
+            
+            logger.debug(f"Lot traité: {len(chunk)} image(s)")
+        
+        logger.info(f"Arrière-plan supprimé pour {len(results)} image(s)")
+        return results
+
+def content_hash(data):
+    """
+    Empreinte exacte du contenu d'un fichier.
+    
+    Args:
+        data (bytes): Contenu du fichier
+    
+    Returns:
+        str: Empreinte SHA-256 hexadécimale
+    """
+    return hashlib.sha256(data).hexdigest()
+
+def dhash(image, hash_size=8):
+    """
+    Empreinte perceptuelle par différence (dHash) : compare chaque pixel à son
+    voisin de droite sur une miniature en niveaux de gris.
+    
+    Args:
+        image (PIL.Image): Image source
+        hash_size (int): Côté de la grille de comparaison (hash_size² bits)
+    
+    Returns:
+        int: Empreinte perceptuelle
+    """
+    # Décodage JPEG réduit directement à basse résolution quand c'est possible
+    image.draft('L', (hash_size * 4, hash_size * 4))
+    thumbnail = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BOX)
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+def hamming_distance(hash_a, hash_b):
+    """Nombre de bits différents entre deux empreintes perceptuelles."""
+    return bin(hash_a ^ hash_b).count('1')
+
+def popcount64(values):
+    """
+    Nombre de bits à 1 de chaque élément d'un tableau uint64.
+    
+    Args:
+        values (np.ndarray): Tableau 1D uint64
+    
+    Returns:
+        np.ndarray: Nombre de bits à 1 par élément
+    """
+    # np.bitwise_count n'existe qu'à partir de NumPy 2.0
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+def output_names(image_paths):
+    """
+    Noms des fichiers de sortie d'un lot : chemin relatif au dossier commun
+    des images, extension remplacée par .txt. Si deux images ne diffèrent
+    que par leur extension, celle-ci est conservée (ex: a.png.txt, a.jpg.txt).
+    
+    Args:
+        image_paths (list): Chemins des images
+    
+    Returns:
+        dict: Chemin de l'image -> chemin relatif du fichier .txt
+    """
+    paths = list(dict.fromkeys(image_paths))
+    if not paths:
+        return {}
+    relative = {path: os.path.abspath(path) for path in paths}
+    base = os.path.commonpath([os.path.dirname(path) for path in relative.values()])
+    relative = {path: os.path.relpath(absolute, base) for path, absolute in relative.items()}
+    
+    groups = {}
+    for path, name in relative.items():
+        groups.setdefault(os.path.splitext(name)[0], []).append(path)
+    
+    names = {}
+    for stem, group in groups.items():
+        for path in group:
+            names[path] = (stem if len(group) == 1 else relative[path]) + '.txt'
+    return names
+
+class DeduplicatingBatchProcessor:
+    """
+    Conversion ASCII d'un lot d'images avec détection des doublons.
+    
+    Chaque fichier reçoit une empreinte exacte (SHA-256) et une empreinte
+    perceptuelle (dHash). Les doublons exacts, et optionnellement les images
+    proches à moins de near_threshold bits près (réencodages, redimensionnements),
+    réutilisent l'art ASCII et l'image sans arrière-plan déjà calculés.
+    
+    Les images de référence sont décodées, détourées et converties par
+    groupes de la taille des lots du détoureur, puis libérées : seules les
+    empreintes, l'art ASCII et quelques images sans arrière-plan restent en mémoire.
+    """
+    
+    # Taille des groupes de décodage quand aucun détoureur n'est utilisé
+    DEFAULT_CHUNK_SIZE = 8
+    
+    def __init__(self, generator=None, near_threshold=None, background_remover=None, no_bg_cache_size=8):
+        """
+        Initialise le traitement par lots.
+        
+        Args:
+            generator (ASCIIGenerator): Générateur à utiliser (nouvelle instance si None)
+            near_threshold (int): Distance de Hamming maximale pour les quasi-doublons
+                                  (None pour ne réutiliser que les doublons exacts)
+            background_remover (BatchBackgroundRemover): Détoureur par lots (créé au besoin si None)
+            no_bg_cache_size (int): Nombre d'images sans arrière-plan (pleine résolution)
+                                    gardées pour d'autres largeurs ou palettes (0 pour aucune)
+        """
+        self.generator = generator or ASCIIGenerator()
+        self.near_threshold = near_threshold
+        self.background_remover = background_remover
+        self.no_bg_cache_size = no_bg_cache_size
+        
+        # Empreinte exacte -> empreinte de l'image de référence (elle-même ou un quasi-doublon)
+        self._canonical = {}
+        # Empreintes perceptuelles (dHash 64 bits) des images de référence, comparées
+        # toutes à la fois ; tableau agrandi par doublement, _references en parallèle
+        self._perceptual = np.empty(64, dtype=np.uint64)
+        self._references = []
+        # Caches indexés par empreinte de référence (images sans arrière-plan : LRU borné)
+        self._ascii_cache = {}
+        self._no_bg_cache = OrderedDict()
+        # Coût mesuré du calcul de chaque entrée, pour estimer le temps économisé
+        self._ascii_cost = {}
+        self._no_bg_cost = {}
+        
+        self.stats = {'images': 0, 'exact_hits': 0, 'near_hits': 0,
+                      'ascii_reused': 0, 'no_bg_reused': 0, 'time_saved': 0.0}
+    
+    def _find_canonical(self, exact_hash, perceptual_hash):
+        """
+        Retourne l'empreinte de l'image de référence d'un fichier et le type de correspondance.
+        
+        Args:
+            exact_hash (str): Empreinte exacte du fichier
+            perceptual_hash (int): Empreinte perceptuelle de l'image
+        
+        Returns:
+            tuple: (empreinte de référence, 'exact' | 'near' | None)
+        """
+        if exact_hash in self._canonical:
+            return self._canonical[exact_hash], 'exact'
+        
+        count = len(self._references)
+        if self.near_threshold is not None and count:
+            distances = popcount64(self._perceptual[:count] ^ np.uint64(perceptual_hash))
+            matches = np.flatnonzero(distances <= self.near_threshold)
+            if matches.size:
+                reference = self._references[matches[0]]
+                self._canonical[exact_hash] = reference
+                return reference, 'near'
+        
+        self._canonical[exact_hash] = exact_hash
+        if count == len(self._perceptual):
+            self._perceptual = np.concatenate([self._perceptual, np.empty_like(self._perceptual)])
+        self._perceptual[count] = perceptual_hash
+        self._references.append(exact_hash)
+        return exact_hash, None
+    
+    def _cache_no_bg(self, key, image):
+        """Ajoute une image sans arrière-plan au cache en évinçant la plus ancienne si besoin."""
+        if self.no_bg_cache_size <= 0:
+            return
+        self._no_bg_cache[key] = image
+        self._no_bg_cache.move_to_end(key)
+        while len(self._no_bg_cache) > self.no_bg_cache_size:
+            self._no_bg_cache.popitem(last=False)
+    
+    def _remove_backgrounds(self, pending):
+        """
+        Supprime par lots l'arrière-plan d'images de référence.
+        
+        Args:
+            pending (dict): Empreinte de référence -> image originale
+        
+        Returns:
+            dict: Empreinte de référence -> image sans arrière-plan (images en échec absentes)
+        """
+        keys = list(pending)
+        start = time.perf_counter()
+        results = self.background_remover.remove_backgrounds([pending[key] for key in keys])
+        cost = (time.perf_counter() - start) / max(len(keys), 1)
+        
+        removed = {}
+        for key, result in zip(keys, results):
+            # En cas d'échec le détoureur rend l'image originale : rien à mettre en cache
+            if result is not pending[key]:
+                removed[key] = result
+                self._no_bg_cost[key] = cost
+        return removed
+    
+    def _convert_chunk(self, references, params):
+        """
+        Décode, détoure et convertit un groupe d'images de référence, puis les libère.
+        
+        Args:
+            references (list): Couples (empreinte de référence, chemin de l'image)
+            params (tuple): (largeur, suppression d'arrière-plan, palette)
+        """
+        width, remove_bg, ascii_chars = params
+        use_no_bg = remove_bg and REMBG_AVAILABLE
+        
+        images = {}
+        for canonical, path in references:
+            try:
+                with Image.open(path) as image:
+                    image.load()
+                    images[canonical] = image
+            except Exception as e:
+                logger.error(f"Erreur lors de la lecture de {path}: {e}")
+        
+        removed = {}
+        if use_no_bg:
+            pending = {key: image for key, image in images.items() if key not in self._no_bg_cache}
+            if pending:
+                removed = self._remove_backgrounds(pending)
+        
+        for canonical, image in images.items():
+            start = time.perf_counter()
+            if canonical in removed:
+                image = removed[canonical]
+                self._cache_no_bg(canonical, image)
+            elif use_no_bg and canonical in self._no_bg_cache:
+                image = self._no_bg_cache[canonical]
+                self._no_bg_cache.move_to_end(canonical)
+                self.stats['no_bg_reused'] += 1
+                self.stats['time_saved'] += self._no_bg_cost[canonical]
+            
+            key = (canonical, params)
+            self._ascii_cache[key] = self.generator.image_to_ascii(image, width, ascii_chars)
+            self._ascii_cost[key] = (time.perf_counter() - start) + (
+                self._no_bg_cost.get(canonical, 0.0) if use_no_bg else 0.0)
+    
+    def process(self, image_paths, width=100, remove_bg=False, ascii_chars=None, output_dir=None):
+        """
+        Convertit un lot d'images en réutilisant les résultats des doublons.
+        
+        Args:
+            image_paths (list): Chemins des images
+            width (int): Largeur en caractères
+            remove_bg (bool): Supprimer l'arrière-plan avant conversion
+            ascii_chars (str): Palette ou mode sous-cellule ('braille')
+            output_dir (str): Dossier où écrire un fichier .txt par image (optionnel),
+                              en conservant les sous-dossiers (voir output_names)
+        
+        Returns:
+            dict: Chemin -> art ASCII (None si l'image n'a pas pu être lue)
+        
+        Les statistiques cumulées (doublons, réutilisations, temps économisé)
+        sont disponibles dans self.stats.
+        """
+        image_paths = list(image_paths)
+        params = (width, remove_bg, ascii_chars)
+        canonical_of = {}
+        # Empreinte de référence -> premier chemin à convertir
+        to_convert = {}
+        
+        # Empreintes : lecture de chaque fichier, sans conserver l'image décodée
+        for path in image_paths:
+            self.stats['images'] += 1
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                canonical, match = self._find_canonical(content_hash(data), dhash(Image.open(io.BytesIO(data))))
+            except Exception as e:
+                logger.error(f"Erreur lors de la lecture de {path}: {e}")
+                canonical_of[path] = None
+                continue
+            
+            canonical_of[path] = canonical
+            if match == 'exact':
+                self.stats['exact_hits'] += 1
+            elif match == 'near':
+                self.stats['near_hits'] += 1
+            
+            if (canonical, params) not in self._ascii_cache:
+                to_convert.setdefault(canonical, path)
+        
+        # Conversion par groupes de la taille des lots du détoureur
+        if remove_bg and REMBG_AVAILABLE and self.background_remover is None:
+            self.background_remover = BatchBackgroundRemover()
+        chunk_size = self.background_remover.batch_size if self.background_remover else self.DEFAULT_CHUNK_SIZE
+        references = list(to_convert.items())
+        for start in range(0, len(references), chunk_size):
+            self._convert_chunk(references[start:start + chunk_size], params)
+        
+        names = output_names(image_paths) if output_dir else {}
+        results = {}
+        for path in image_paths:
+            canonical = canonical_of[path]
+            key = (canonical, params)
+            if canonical is None or key not in self._ascii_cache:
+                results[path] = None
+                continue
+            
+            # Le premier chemin d'une image convertie dans ce lot n'est pas une réutilisation
+            if to_convert.get(canonical) == path:
+                del to_convert[canonical]
+            else:
+                self.stats['ascii_reused'] += 1
+                self.stats['time_saved'] += self._ascii_cost[key]
+            results[path] = self._ascii_cache[key]
+            
+            if output_dir:
+                output_path = os.path.join(output_dir, names[path])
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                with open_writer(output_path) as writer:
+                    writer.write_text(results[path])
+        
+        logger.info(f"Lot traité: {self.stats['images']} images, "
+                    f"{self.stats['exact_hits']} doublons exacts, {self.stats['near_hits']} quasi-doublons, "
+                    f"{self.stats['time_saved']:.2f} s économisées")
+        return results
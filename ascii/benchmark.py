@@ -0,0 +1,186 @@
+"""Mesures de performance du générateur ASCII."""
+
+import sys
+import os
+import time
+import io
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger.logger import logger
+from PIL import Image
+import numpy as np
+
+from generator import ASCIIGenerator, REMBG_AVAILABLE, composite_on_black
+from batch import BatchBackgroundRemover
+from palettes import codes_to_lines
+from writers import open_writer, ZSTD_AVAILABLE
+from kernels import get_backend, available_backends
+
+# Import conditionnel pour la mesure séquentielle sur une session partagée
+if REMBG_AVAILABLE:
+    from rembg import new_session, remove
+
+def _images_per_second(count, elapsed):
+    """Retourne un débit en images par seconde."""
+    return count / elapsed if elapsed > 0 else float('inf')
+
+def benchmark_background_removal(image_paths, batch_sizes=(1, 4, 8)):
+    """
+    Compare la suppression d'arrière-plan image par image et par lots sur CPU.
+    
+    Args:
+        image_paths (list): Chemins des images de test
+        batch_sizes (tuple): Tailles de lot à mesurer
+    
+    Returns:
+        dict: Débit en images/s pour 'sequential_per_call' (ASCIIGenerator.remove_background,
+              qui crée une session et passe par PNG à chaque appel), 'sequential' (une
+              session CPU créée à l'avance, comme les lots) et pour chaque taille de lot
+    """
+    if not REMBG_AVAILABLE:
+        logger.warning("rembg non disponible - Mesure de la suppression d'arrière-plan ignorée")
+        return {}
+    
+    images = []
+    for path in image_paths:
+        with Image.open(path) as image:
+            images.append(image.convert('RGB'))
+    
+    results = {}
+    
+    # Chemin actuel du générateur : chargement du modèle compris dans chaque appel
+    generator = ASCIIGenerator()
+    start = time.perf_counter()
+    for image in images:
+        generator.remove_background(image)
+    results['sequential_per_call'] = _images_per_second(len(images), time.perf_counter() - start)
+    logger.info(f"Séquentiel (session par appel): {results['sequential_per_call']:.2f} images/s")
+    
+    # Référence équitable pour les lots : même modèle, session CPU chargée hors mesure
+    session = new_session('u2net', providers=['CPUExecutionProvider'])
+    start = time.perf_counter()
+    for image in images:
+        composite_on_black(remove(image, session=session))
+    results['sequential'] = _images_per_second(len(images), time.perf_counter() - start)
+    logger.info(f"Séquentiel (session partagée): {results['sequential']:.2f} images/s")
+    
+    for batch_size in batch_sizes:
+        remover = BatchBackgroundRemover(batch_size=batch_size, providers=['CPUExecutionProvider'])
+        # Le chargement du modèle n'est pas compté dans la mesure
+        remover._get_session()
+        
+        start = time.perf_counter()
+        remover.remove_backgrounds(images)
+        results[f'batch_{batch_size}'] = _images_per_second(len(images), time.perf_counter() - start)
+        logger.info(f"Lots de {batch_size}: {results[f'batch_{batch_size}']:.2f} images/s")
+    
+    return results
+
+def benchmark_writers(width=4000, height=2000, chunk_rows=64, palette_name='detailed'):
+    """
+    Mesure le débit d'écriture (octets/s) d'une grande sortie ASCII selon la destination.
+    
+    Args:
+        width (int): Largeur de la sortie en caractères
+        height (int): Nombre de lignes
+        chunk_rows (int): Lignes écrites par bloc en flux
+        palette_name (str): Palette utilisée pour produire les caractères
+    
+    Returns:
+        dict: Débit en octets/s pour la référence (join + write) et chaque destination
+    """
+    palette = ASCIIGenerator.get_palette(palette_name)
+    pixels = np.random.default_rng(0).integers(0, 256, size=(height, width), dtype=np.uint8)
+    results = {}
+    
+    with tempfile.TemporaryDirectory() as directory:
+        # Référence : une chaîne par ligne, jointes puis écrites en une fois
+        path = os.path.join(directory, 'reference.txt')
+        start = time.perf_counter()
+        text = '\n'.join(codes_to_lines(palette.codes[pixels]))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        results['reference'] = len(text.encode('utf-8')) / (time.perf_counter() - start)
+        
+        destinations = {
+            'plain': os.path.join(directory, 'out.txt'),
+            'gzip': os.path.join(directory, 'out.txt.gz'),
+            'memory': io.BytesIO()
+        }
+        if ZSTD_AVAILABLE:
+            destinations['zstd'] = os.path.join(directory, 'out.txt.zst')
+        
+        for name, destination in destinations.items():
+            start = time.perf_counter()
+            with open_writer(destination) as writer:
+                for row in range(0, height, chunk_rows):
+                    writer.write_codes(palette.codes[pixels[row:row + chunk_rows]])
+            results[name] = writer.bytes_written / (time.perf_counter() - start)
+    
+    for name, rate in results.items():
+        logger.info(f"Écriture {name}: {rate / 1e6:.1f} Mo/s")
+    return results
+
+def benchmark_kernels(width=4000, height=3000, output_width=200, repeat=5):
+    """
+    Mesure chaque noyau sur tous les backends disponibles et vérifie que leurs
+    résultats sont identiques à ceux du backend NumPy.
+    
+    Args:
+        width (int): Largeur de l'image de test en pixels
+        height (int): Hauteur de l'image de test en pixels
+        output_width (int): Largeur de sortie en caractères
+        repeat (int): Nombre de répétitions par mesure
+    
+    Returns:
+        dict: Backend -> {noyau: durée moyenne en ms}
+    """
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    output_height = int(height / width * output_width * 0.55)
+    codes = ASCIIGenerator.get_palette('standard').codes
+    
+    reference = get_backend('numpy')
+    gray = reference.luma(rgb)
+    small = reference.cell_average(gray, output_height, output_width)
+    cases = {
+        'luma': lambda kernels: kernels.luma(rgb),
+        'cell_average': lambda kernels: kernels.cell_average(gray, output_height, output_width),
+        'quantize': lambda kernels: kernels.quantize(gray, codes),
+        'ordered_dither': lambda kernels: kernels.ordered_dither(gray),
+        'render': lambda kernels: kernels.render(rgb, output_height, output_width, codes)
+    }
+    expected = {name: case(reference) for name, case in cases.items()}
+    # Le rendu fusionné doit correspondre à l'enchaînement des étapes
+    assert np.array_equal(expected['render'], reference.quantize(small, codes))
+    
+    results = {}
+    for backend in available_backends():
+        kernels = get_backend(backend)
+        kernels.warm_up()
+        results[backend] = {}
+        for name, case in cases.items():
+            # Mesurer un backend faux n'a pas de sens (parité détaillée : tests/test_kernels.py)
+            if not np.array_equal(case(kernels), expected[name]):
+                raise RuntimeError(f"Résultat différent du backend NumPy: {backend}.{name}")
+            start = time.perf_counter()
+            for _ in range(repeat):
+                case(kernels)
+            results[backend][name] = (time.perf_counter() - start) / repeat * 1000
+            logger.info(f"{backend}.{name}: {results[backend][name]:.2f} ms")
+    
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python ascii/benchmark.py image1 [image2 ...]")
+        print("       python ascii/benchmark.py writers")
+        print("       python ascii/benchmark.py kernels")
+        sys.exit(1)
+    if sys.argv[1] == 'writers':
+        benchmark_writers()
+    elif sys.argv[1] == 'kernels':
+        benchmark_kernels()
+    else:
+        benchmark_background_removal(sys.argv[1:])
@@ -5,6 +5,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from logger.logger import logger
 from PIL import Image
 import numpy as np
+import threading
+import contextlib
+import io
+from collections import namedtuple
+
+from pyramid import GrayscalePyramid
+from palettes import Palette, calibrate_palette, pixels_to_braille, braille_codes, BRAILLE_CELL, DEFAULT_CACHE_DIR
+from writers import open_writer
 
 # Import conditionnel pour rembg
 try:
@@ -15,10 +23,39 @@ except ImportError:
     REMBG_AVAILABLE = False
     logger.warning("rembg non disponible - Suppression d'arrière-plan désactivée")
 
+# Instantané immuable du cache d'image : jamais modifié sur place, toujours
+# remplacé en bloc, ce qui permet aux lecteurs de s'en passer de verrou.
+_CacheSnapshot = namedtuple('_CacheSnapshot', ['image_path', 'original_image', 'no_bg_image',
+                                               'pyramid', 'no_bg_pyramid'])
+_EMPTY_SNAPSHOT = _CacheSnapshot(None, None, None, None, None)
+
+def composite_on_black(image):
+    """
+    Remplace la transparence d'une image détourée par un fond noir.
+    
+    Args:
+        image (PIL.Image): Image détourée (RGBA) ou image opaque
+    
+    Returns:
+        PIL.Image: Image RGB sur fond noir, ou l'image inchangée si elle n'est pas RGBA
+    """
+    if image.mode != 'RGBA':
+        return image
+    
+    # Créer une image noire de la même taille
+    background = Image.new('RGB', image.size, (0, 0, 0))
+    # Composer l'image avec le fond noir
+    background.paste(image, mask=image.split()[-1])  # Utiliser le canal alpha comme masque
+    return background
+
 class ASCIIGenerator:
     """
     Générateur d'images ASCII à partir d'images classiques.
     Supporte différents niveaux de détail et styles de caractères.
+    
+    Une même instance peut être partagée entre plusieurs threads : les
+    paramètres de rendu (largeur, palette, arrière-plan) sont passés à chaque
+    appel et le cache est un instantané immuable remplacé atomiquement.
     """
     
     # Différentes palettes de caractères ASCII (du plus sombre au plus clair)
@@ -29,30 +66,198 @@ class ASCIIGenerator:
         'standard': " .,-:;i=+%O#@"
     }
     
+    # Palettes construites (tables de correspondance), indexées par nom
+    _PALETTES = {}
+    # Protège la cohérence entre ASCII_CHARS et _PALETTES (enregistrement concurrent)
+    _PALETTES_LOCK = threading.Lock()
+    
+    # Modes de rendu sous-cellule : taille du bloc de pixels (largeur, hauteur) par caractère
+    SUBCELL_MODES = {
+        'braille': BRAILLE_CELL
+    }
+    
     def __init__(self, ascii_chars='standard'):
         """
         Initialise le générateur ASCII.
         
         Args:
-            ascii_chars (str): Type de caractères à utiliser ('simple', 'detailed', 'blocks', 'standard')
+            ascii_chars (str): Palette par défaut ('simple', 'detailed', 'blocks', 'standard')
         """
-        self.chars = self.ASCII_CHARS.get(ascii_chars, self.ASCII_CHARS['standard'])
+        self.chars = self.get_chars(ascii_chars)
+        self.palette = self.get_palette(ascii_chars)
         
-        # Cache pour optimiser le traitement d'images
-        self._image_cache = {}
-        self._last_image_path = None
-        self._original_image = None
-        self._no_bg_image = None
+        # Cache pour optimiser le traitement d'images (lu sans verrou)
+        self._snapshot = _EMPTY_SNAPSHOT
+        # Le verrou ne protège que la publication d'un nouvel instantané
+        self._snapshot_lock = threading.Lock()
         
         logger.info(f"Générateur ASCII initialisé avec la palette '{ascii_chars}'")
     
+    @classmethod
+    def get_chars(cls, ascii_chars):
+        """
+        Retourne la chaîne de caractères associée à un nom de palette.
+        
+        Args:
+            ascii_chars (str): Nom de la palette
+        
+        Returns:
+            str: Caractères de la palette ('standard' si le nom est inconnu)
+        """
+        return cls.ASCII_CHARS.get(ascii_chars, cls.ASCII_CHARS['standard'])
+    
+    @classmethod
+    def get_palette(cls, ascii_chars):
+        """
+        Retourne la palette (caractères et table de correspondance) associée à un nom.
+        
+        Args:
+            ascii_chars (str): Nom de la palette
+        
+        Returns:
+            Palette: Palette calibrée si enregistrée comme telle, linéaire sinon
+        """
+        with cls._PALETTES_LOCK:
+            if ascii_chars not in cls.ASCII_CHARS:
+                ascii_chars = 'standard'
+            palette = cls._PALETTES.get(ascii_chars)
+            # Caractères modifiés directement dans ASCII_CHARS : table linéaire reconstruite
+            if palette is None or palette.chars != cls.ASCII_CHARS[ascii_chars]:
+                palette = Palette.linear(cls.ASCII_CHARS[ascii_chars])
+                cls._PALETTES[ascii_chars] = palette
+            return palette
+    
+    @classmethod
+    def register_palette(cls, name, chars, calibrate=True, font_path=None, font_size=24, levels=None,
+                         cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Enregistre une palette personnalisée, éventuellement calibrée d'après
+        la densité d'encre de ses caractères.
+        
+        Args:
+            name (str): Nom de la palette
+            chars (str): Caractères (ordre quelconque si calibrate, du plus sombre au plus clair sinon)
+            calibrate (bool): Trier et répartir les caractères selon leur densité mesurée
+            font_path (str): Police utilisée pour la calibration (police par défaut de PIL si None)
+            font_size (int): Taille de rendu pour la calibration
+            levels (int): Nombre de niveaux à conserver après calibration
+            cache_dir (str): Dossier du cache des tables calibrées (désactivé si None)
+        
+        Returns:
+            Palette: Palette enregistrée
+        
+        Raises:
+            ValueError: Nom réservé à un mode sous-cellule, palette vide ou non calibrable
+        """
+        if name in cls.SUBCELL_MODES:
+            raise ValueError(f"Le nom '{name}' est réservé au mode sous-cellule correspondant")
+        
+        if calibrate:
+            palette = calibrate_palette(chars, font_path, font_size, levels, cache_dir)
+        else:
+            if not chars:
+                raise ValueError("La palette doit contenir au moins un caractère")
+            palette = Palette.linear(chars)
+        
+        # Les deux tables changent ensemble : un lecteur ne voit jamais une palette
+        # dont les caractères diffèrent de ASCII_CHARS (il la remplacerait par une table linéaire)
+        with cls._PALETTES_LOCK:
+            cls._PALETTES[name] = palette
+            cls.ASCII_CHARS[name] = palette.chars
+        logger.info(f"Palette '{name}' enregistrée ({len(palette.chars)} niveaux)")
+        return palette
+    
+    def _resolve_palette(self, ascii_chars):
+        """Retourne la palette d'un appel, ou celle de l'instance par défaut."""
+        if ascii_chars is None:
+            return self.palette
+        return self.get_palette(ascii_chars)
+    
+    def _load_snapshot(self, image_path):
+        """
+        Retourne l'instantané de cache correspondant à une image, en la
+        chargeant depuis le disque si nécessaire.
+        
+        Args:
+            image_path (str): Chemin vers l'image
+        
+        Returns:
+            _CacheSnapshot: Instantané contenant l'image originale
+        """
+        snapshot = self._snapshot
+        if snapshot.image_path == image_path:
+            logger.debug("Utilisation de l'image en cache")
+            return snapshot
+        
+        logger.info(f"Chargement d'une nouvelle image: {image_path}")
+        
+        # Chargement complet hors verrou : l'image partagée ne doit plus
+        # dépendre du fichier (le décodage paresseux de PIL n'est pas thread-safe).
+        # La sortie du bloc ne ferme que le fichier, le tampon décodé est
+        # conservé tel quel, sans copie
+        with Image.open(image_path) as image:
+            image.load()
+            original_image = image
+        
+        snapshot = _CacheSnapshot(image_path, original_image, None, None, None)
+        with self._snapshot_lock:
+            self._snapshot = snapshot
+        
+        logger.info(f"Image chargée: {image_path} - Taille: {original_image.size}")
+        return snapshot
+    
+    def _update_snapshot(self, snapshot, **fields):
+        """
+        Publie un instantané enrichi si l'instantané courant concerne toujours
+        la même image.
+        
+        Args:
+            snapshot (_CacheSnapshot): Instantané à partir duquel le calcul a été fait
+            **fields: Champs à remplacer (no_bg_image, pyramid, no_bg_pyramid)
+        
+        Returns:
+            _CacheSnapshot: Instantané mis à jour
+        """
+        with self._snapshot_lock:
+            current = self._snapshot
+            if current.image_path == snapshot.image_path:
+                # Repartir de l'instantané courant pour ne pas perdre un champ
+                # publié entre-temps par un autre thread
+                updated = current._replace(**fields)
+                self._snapshot = updated
+            else:
+                updated = snapshot._replace(**fields)
+        return updated
+    
+    def _get_pyramid(self, snapshot, no_bg=False):
+        """
+        Retourne la pyramide de l'image en cache, construite à la première demande.
+        
+        Args:
+            snapshot (_CacheSnapshot): Instantané de l'image
+            no_bg (bool): Pyramide de l'image sans arrière-plan plutôt que de l'originale
+        
+        Returns:
+            tuple: (GrayscalePyramid, instantané éventuellement mis à jour)
+        """
+        field = 'no_bg_pyramid' if no_bg else 'pyramid'
+        pyramid = getattr(snapshot, field)
+        if pyramid is None:
+            pyramid = GrayscalePyramid(snapshot.no_bg_image if no_bg else snapshot.original_image)
+            snapshot = self._update_snapshot(snapshot, **{field: pyramid})
+            logger.info(f"Pyramide mise en cache ({pyramid.nbytes / 1e6:.1f} Mo)")
+        return pyramid, snapshot
+    
     def load_image(self, image_path):
         """
         Charge une image depuis un fichier avec mise en cache.
         
+        L'image retournée est une copie : la modifier ne touche pas le cache
+        utilisé par generate_ascii.
+        
         Args:
             image_path (str): Chemin vers l'image
-            
+        
         Returns:
             PIL.Image: Image chargée ou None si erreur
         """
@@ -61,43 +266,67 @@ class ASCIIGenerator:
                 logger.error(f"Le fichier {image_path} n'existe pas")
                 return None
             
-            # Vérifier si c'est une nouvelle image
-            if image_path != self._last_image_path:
-                logger.info(f"Chargement d'une nouvelle image: {image_path}")
-                
-                # Nettoyer le cache pour la nouvelle image
-                self._clear_cache()
-                
-                # Charger la nouvelle image
-                image = Image.open(image_path)
-                self._original_image = image.copy()
-                self._last_image_path = image_path
-                
-                logger.info(f"Image chargée: {image_path} - Taille: {image.size}")
-            else:
-                logger.debug("Utilisation de l'image en cache")
-                image = self._original_image.copy()
-                
-            return image
-            
+            return self._load_snapshot(image_path).original_image.copy()
+        
         except Exception as e:
             logger.error(f"Erreur lors du chargement de l'image: {e}")
             return None
     
-    def _clear_cache(self):
+    def clear_cache(self):
         """Nettoie le cache des images traitées."""
-        self._image_cache.clear()
-        self._original_image = None
-        self._no_bg_image = None
+        with self._snapshot_lock:
+            self._snapshot = _EMPTY_SNAPSHOT
         logger.debug("Cache des images nettoyé")
     
+    def get_cache_info(self):
+        """
+        Retourne l'état courant du cache.
+        
+        Returns:
+            dict: Chemin de l'image en cache, présence de l'image sans fond et
+                  mémoire occupée par les pyramides (octets)
+        """
+        snapshot = self._snapshot
+        pyramids = [pyramid for pyramid in (snapshot.pyramid, snapshot.no_bg_pyramid) if pyramid is not None]
+        return {
+            'image_path': snapshot.image_path,
+            'no_bg_cached': snapshot.no_bg_image is not None,
+            'pyramid_bytes': sum(pyramid.nbytes for pyramid in pyramids)
+        }
+    
+    def _remove_background(self, image):
+        """
+        Supprime l'arrière-plan et compose le résultat sur un fond noir.
+        
+        Args:
+            image (PIL.Image): Image source
+        
+        Returns:
+            PIL.Image: Image sans arrière-plan
+        
+        Raises:
+            Exception: Toute erreur levée par rembg ou PIL
+        """
+        # Convertir en bytes pour rembg
+        img_byte_arr = io.BytesIO()
+        image.save(img_byte_arr, format='PNG')
+        img_byte_arr = img_byte_arr.getvalue()
+        
+        # Supprimer l'arrière-plan
+        output = remove(img_byte_arr)
+        
+        # Reconvertir en PIL Image
+        result_image = Image.open(io.BytesIO(output))
+        
+        return composite_on_black(result_image)
+    
     def remove_background(self, image):
         """
-        Supprime l'arrière-plan de l'image avec mise en cache.
+        Supprime l'arrière-plan de l'image.
         
         Args:
             image (PIL.Image): Image source
-            
+        
         Returns:
             PIL.Image: Image sans arrière-plan ou image originale si erreur
         """
@@ -105,62 +334,50 @@ class ASCIIGenerator:
             logger.warning("rembg non disponible - Suppression d'arrière-plan ignorée")
             return image
         
-        # Vérifier si on a déjà traité cette image
-        if self._no_bg_image is not None:
-            logger.debug("Utilisation de l'image sans arrière-plan en cache")
-            return self._no_bg_image.copy()
-        
         try:
             logger.info("Suppression de l'arrière-plan en cours...")
-            
-            # Convertir en bytes pour rembg
-            import io
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format='PNG')
-            img_byte_arr = img_byte_arr.getvalue()
-            
-            # Supprimer l'arrière-plan
-            output = remove(img_byte_arr)
-            
-            # Reconvertir en PIL Image
-            result_image = Image.open(io.BytesIO(output))
-            
-            # Créer un fond noir pour remplacer la transparence
-            if result_image.mode == 'RGBA':
-                # Créer une image noire de la même taille
-                background = Image.new('RGB', result_image.size, (0, 0, 0))
-                # Composer l'image avec le fond noir
-                background.paste(result_image, mask=result_image.split()[-1])  # Utiliser le canal alpha comme masque
-                result_image = background
-            
-            # Mettre en cache le résultat
-            self._no_bg_image = result_image.copy()
-            logger.info("Arrière-plan supprimé avec succès et mis en cache")
-            
+            result_image = self._remove_background(image)
+            logger.info("Arrière-plan supprimé avec succès")
             return result_image
-            
+        
         except Exception as e:
             logger.error(f"Erreur lors de la suppression d'arrière-plan: {e}")
             logger.info("Utilisation de l'image originale")
             return image
     
-    def resize_image(self, image, width=100):
+    def _output_size(self, image_size, width, cell_size=(1, 1)):
         """
-        Redimensionne l'image en conservant les proportions.
+        Calcule la taille en pixels de l'image à convertir.
         
         Args:
-            image (PIL.Image): Image à redimensionner
+            image_size (tuple): Taille (largeur, hauteur) de l'image source
             width (int): Largeur désirée en caractères
-            
+            cell_size (tuple): Pixels (largeur, hauteur) échantillonnés par caractère
+        
         Returns:
-            PIL.Image: Image redimensionnée
+            tuple: Taille cible (largeur, hauteur) en pixels
         """
         # Calcul de la hauteur proportionnelle (caractères ASCII sont plus hauts que larges)
-        aspect_ratio = image.height / image.width
+        aspect_ratio = image_size[1] / image_size[0]
         height = int(aspect_ratio * width * 0.55)  # 0.55 pour compenser la forme des caractères
         
-        resized_image = image.resize((width, height))
-        logger.debug(f"Image redimensionnée: {width}x{height}")
+        cell_width, cell_height = cell_size
+        return width * cell_width, height * cell_height
+    
+    def resize_image(self, image, width=100, cell_size=(1, 1)):
+        """
+        Redimensionne l'image en conservant les proportions.
+        
+        Args:
+            image (PIL.Image): Image à redimensionner
+            width (int): Largeur désirée en caractères
+            cell_size (tuple): Pixels (largeur, hauteur) échantillonnés par caractère
+        
+        Returns:
+            PIL.Image: Image redimensionnée
+        """
+        resized_image = image.resize(self._output_size(image.size, width, cell_size))
+        logger.debug(f"Image redimensionnée: {resized_image.width}x{resized_image.height}")
         return resized_image
     
     def convert_to_grayscale(self, image):
@@ -169,7 +386,7 @@ class ASCIIGenerator:
         
         Args:
             image (PIL.Image): Image couleur
-            
+        
         Returns:
             PIL.Image: Image en niveaux de gris
         """
@@ -177,39 +394,147 @@ class ASCIIGenerator:
         logger.debug("Image convertie en niveaux de gris")
         return grayscale
     
-    def pixels_to_ascii(self, image):
+    def pixels_to_ascii(self, image, chars=None):
         """
         Convertit les pixels en caractères ASCII.
         
         Args:
             image (PIL.Image): Image en niveaux de gris
-            
+            chars (str | Palette): Caractères ou palette à utiliser (palette de l'instance par défaut)
+        
         Returns:
             list: Liste de chaînes ASCII (une par ligne)
         """
         # Conversion en array numpy pour traitement plus rapide
-        pixels = np.array(image)
+        pixels = np.asarray(image, dtype=np.uint8)
         
-        # Normalisation des valeurs de pixels vers l'indice des caractères
-        pixel_range = 256.0
-        char_range = len(self.chars)
+        if chars is None:
+            palette = self.palette
+        elif isinstance(chars, Palette):
+            palette = chars
+        else:
+            palette = Palette.linear(chars)
         
-        # Calcul sécurisé pour éviter l'overflow
-        ascii_pixels = (pixels.astype(float) * (char_range - 1) / (pixel_range - 1)).astype(int)
+        # Une seule indexation dans la table niveau de gris -> caractère
+        ascii_lines = palette.map_pixels(pixels)
         
-        # S'assurer que les indices sont dans la bonne plage
-        ascii_pixels = np.clip(ascii_pixels, 0, char_range - 1)
+        logger.debug(f"Conversion terminée: {len(ascii_lines)} lignes générées")
+        return ascii_lines
+    
+    def pixels_to_braille(self, image, dither=True):
+        """
+        Convertit les pixels en caractères Braille (un caractère par bloc de 2x4 pixels).
         
-        # Conversion en caractères ASCII
-        ascii_lines = []
-        for row in ascii_pixels:
-            ascii_line = ''.join([self.chars[pixel] for pixel in row])
-            ascii_lines.append(ascii_line)
+        Args:
+            image (PIL.Image): Image en niveaux de gris, redimensionnée avec cell_size=BRAILLE_CELL
+            dither (bool): Tramage ordonné plutôt que seuil fixe
         
-        logger.debug(f"Conversion terminée: {len(ascii_lines)} lignes générées")
+        Returns:
+            list: Liste de chaînes Braille (une par ligne)
+        """
+        pixels = np.asarray(image, dtype=np.uint8)
+        ascii_lines = pixels_to_braille(pixels, dither=dither)
+        
+        logger.debug(f"Conversion Braille terminée: {len(ascii_lines)} lignes générées")
         return ascii_lines
     
-    def generate_ascii(self, image_path, width=100, save_to_file=None, remove_bg=False, progress_callback=None):
+    def image_to_ascii(self, image, width=100, ascii_chars=None):
+        """
+        Convertit une image déjà chargée en art ASCII, sans passer par le cache.
+        
+        Le redimensionnement passe par une GrayscalePyramid, comme generate_ascii :
+        pour une même image, le résultat est identique.
+        
+        Args:
+            image (PIL.Image): Image source
+            width (int): Largeur en caractères
+            ascii_chars (str): Palette ou mode sous-cellule ('braille') (palette de l'instance par défaut)
+        
+        Returns:
+            str: Art ASCII
+        """
+        cell_size = self.SUBCELL_MODES.get(ascii_chars, (1, 1))
+        
+        size = self._output_size(image.size, width, cell_size)
+        image = GrayscalePyramid(image).resize(size)
+        
+        if ascii_chars in self.SUBCELL_MODES:
+            ascii_lines = self.pixels_to_braille(image)
+        else:
+            ascii_lines = self.pixels_to_ascii(image, self._resolve_palette(ascii_chars))
+        return '\n'.join(ascii_lines)
+    
+    def _prepare_image(self, image_path, width, remove_bg, ascii_chars, update_progress):
+        """
+        Charge l'image (avec cache), supprime l'arrière-plan si demandé et la
+        ramène en niveaux de gris à la taille de sortie.
+        
+        Args:
+            image_path (str): Chemin vers l'image source
+            width (int): Largeur en caractères
+            remove_bg (bool): Supprimer l'arrière-plan avant conversion
+            ascii_chars (str): Palette ou mode sous-cellule
+            update_progress (callable): Fonction de progression
+        
+        Returns:
+            tuple: (image en niveaux de gris, palette ou None en mode Braille),
+                   ou (None, None) si erreur
+        """
+        cell_size = self.SUBCELL_MODES.get(ascii_chars, (1, 1))
+        palette = None if ascii_chars in self.SUBCELL_MODES else self._resolve_palette(ascii_chars)
+        
+        # Chargement de l'image (avec cache) : l'instantané est lu une seule
+        # fois pour que tout l'appel travaille sur la même image
+        if not os.path.exists(image_path):
+            logger.error(f"Le fichier {image_path} n'existe pas")
+            update_progress("❌ Erreur", "Impossible de charger l'image")
+            return None, None
+        try:
+            snapshot = self._load_snapshot(image_path)
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement de l'image: {e}")
+            update_progress("❌ Erreur", "Impossible de charger l'image")
+            return None, None
+        image = snapshot.original_image
+        use_no_bg = False
+        
+        # Suppression de l'arrière-plan si demandée (avec cache)
+        if remove_bg:
+            if snapshot.no_bg_image is not None:
+                update_progress("Arrière-plan", "Utilisation de l'image sans fond en cache...")
+                logger.debug("Utilisation de l'image sans arrière-plan en cache")
+                image = snapshot.no_bg_image
+                use_no_bg = True
+            elif not REMBG_AVAILABLE:
+                logger.warning("rembg non disponible - Suppression d'arrière-plan ignorée")
+            else:
+                update_progress("Suppression arrière-plan", "Traitement IA en cours (peut prendre quelques secondes)...")
+                try:
+                    logger.info("Suppression de l'arrière-plan en cours...")
+                    image = self._remove_background(image)
+                    snapshot = self._update_snapshot(snapshot, no_bg_image=image)
+                    use_no_bg = True
+                    logger.info("Arrière-plan supprimé avec succès et mis en cache")
+                except Exception as e:
+                    logger.error(f"Erreur lors de la suppression d'arrière-plan: {e}")
+                    logger.info("Utilisation de l'image originale")
+        
+        # Pyramide en niveaux de gris construite une seule fois par image : les
+        # changements de largeur suivants partent du niveau le plus proche
+        if (snapshot.no_bg_pyramid if use_no_bg else snapshot.pyramid) is None:
+            update_progress("Conversion niveaux de gris", "Construction de la pyramide multi-résolution...")
+        pyramid, snapshot = self._get_pyramid(snapshot, no_bg=use_no_bg)
+        
+        update_progress("Redimensionnement", f"Ajustement à {width} caractères de largeur...")
+        # Redimensionnement depuis le niveau de pyramide le plus proche
+        size = self._output_size(image.size, width, cell_size)
+        image = pyramid.resize(size)
+        logger.debug(f"Image redimensionnée: {size[0]}x{size[1]}")
+        
+        return image, palette
+    
+    def generate_ascii(self, image_path, width=100, save_to_file=None, remove_bg=False, progress_callback=None,
+                       ascii_chars=None):
         """
         Génère l'art ASCII à partir d'une image avec optimisations de cache.
         
@@ -219,7 +544,8 @@ class ASCIIGenerator:
             save_to_file (str): Chemin pour sauvegarder (optionnel)
             remove_bg (bool): Supprimer l'arrière-plan avant conversion
             progress_callback (callable): Fonction appelée pour indiquer la progression
-            
+            ascii_chars (str): Palette ou mode sous-cellule ('braille') pour cet appel (palette de l'instance par défaut)
+        
         Returns:
             str: Art ASCII ou None si erreur
         """
@@ -233,39 +559,24 @@ class ASCIIGenerator:
         
         update_progress("Chargement de l'image", "Lecture du fichier depuis le disque...")
         
-        # Chargement de l'image (avec cache)
-        image = self.load_image(image_path)
+        image, palette = self._prepare_image(image_path, width, remove_bg, ascii_chars, update_progress)
         if image is None:
-            update_progress("❌ Erreur", "Impossible de charger l'image")
             return None
         
-        # Suppression de l'arrière-plan si demandée (avec cache)
-        if remove_bg:
-            if self._no_bg_image is not None:
-                update_progress("Arrière-plan", "Utilisation de l'image sans fond en cache...")
-            else:
-                update_progress("Suppression arrière-plan", "Traitement IA en cours (peut prendre quelques secondes)...")
-            image = self.remove_background(image)
-        
-        update_progress("Redimensionnement", f"Ajustement à {width} caractères de largeur...")
-        # Redimensionnement
-        image = self.resize_image(image, width)
-        
-        update_progress("Conversion niveaux de gris", "Transformation de l'image en monochrome...")
-        # Conversion en niveaux de gris
-        image = self.convert_to_grayscale(image)
-        
         update_progress("Génération ASCII", "Conversion des pixels en caractères...")
         # Conversion en ASCII
-        ascii_lines = self.pixels_to_ascii(image)
+        if palette is None:
+            ascii_lines = self.pixels_to_braille(image)
+        else:
+            ascii_lines = self.pixels_to_ascii(image, palette)
         ascii_art = '\n'.join(ascii_lines)
         
-        # Sauvegarde si demandée
+        # Sauvegarde si demandée (compression selon l'extension .gz / .zst)
         if save_to_file:
             update_progress("Sauvegarde", f"Écriture dans {save_to_file}...")
             try:
-                with open(save_to_file, 'w', encoding='utf-8') as f:
-                    f.write(ascii_art)
+                with open_writer(save_to_file) as writer:
+                    writer.write_text(ascii_art)
                 logger.info(f"Art ASCII sauvegardé dans: {save_to_file}")
             except Exception as e:
                 logger.error(f"Erreur lors de la sauvegarde: {e}")
@@ -273,4 +584,54 @@ class ASCIIGenerator:
         
         update_progress("✅ Terminé", f"Art ASCII généré avec succès ({len(ascii_lines)} lignes)")
         logger.info("Génération ASCII terminée avec succès")
-        return ascii_art
\ No newline at end of file
+        return ascii_art
+    
+    def stream_ascii(self, image_path, destination, width=100, remove_bg=False, ascii_chars=None,
+                     chunk_rows=64, compression=None):
+        """
+        Génère l'art ASCII et l'écrit en flux, par blocs de lignes, sans
+        construire le texte complet en mémoire.
+        
+        Args:
+            image_path (str): Chemin vers l'image source
+            destination (str | file): Fichier, '-' pour la sortie standard ou flux ouvert
+            width (int): Largeur en caractères
+            remove_bg (bool): Supprimer l'arrière-plan avant conversion
+            ascii_chars (str): Palette ou mode sous-cellule ('braille') pour cet appel
+            chunk_rows (int): Nombre de lignes converties et écrites à la fois
+            compression (str): 'gzip', 'zstd' ou None (déduit de l'extension)
+        
+        Returns:
+            int: Nombre d'octets écrits (avant compression) ou None si erreur
+        """
+        # Quand stdout porte l'art ASCII, les messages passent sur stderr
+        to_stdout = destination == '-' or destination is sys.stdout or destination is getattr(sys.stdout, 'buffer', None)
+        with logger.redirect(sys.stderr) if to_stdout else contextlib.nullcontext():
+            return self._stream_ascii(image_path, destination, width, remove_bg, ascii_chars, chunk_rows, compression)
+    
+    def _stream_ascii(self, image_path, destination, width, remove_bg, ascii_chars, chunk_rows, compression):
+        """Implémentation de stream_ascii (voir cette méthode)."""
+        logger.info(f"Génération ASCII en flux pour: {image_path}")
+        
+        image, palette = self._prepare_image(image_path, width, remove_bg, ascii_chars, lambda *args: None)
+        if image is None:
+            return None
+        pixels = np.asarray(image, dtype=np.uint8)
+        
+        try:
+            with open_writer(destination, compression) as writer:
+                if palette is None:
+                    # Mode Braille : chaque ligne de caractères couvre plusieurs lignes de pixels
+                    cell_height = self.SUBCELL_MODES[ascii_chars][1]
+                    step = chunk_rows * cell_height
+                    for start in range(0, pixels.shape[0], step):
+                        writer.write_codes(braille_codes(pixels[start:start + step]))
+                else:
+                    for start in range(0, pixels.shape[0], chunk_rows):
+                        writer.write_codes(palette.codes[pixels[start:start + chunk_rows]])
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture en flux: {e}")
+            return None
+        
+        logger.info(f"Art ASCII écrit en flux: {writer.rows_written} lignes, {writer.bytes_written:,} octets")
+        return writer.bytes_written
@@ -4,6 +4,8 @@ from tkinter import filedialog, messagebox, ttk
 import threading
 
 from generator import ASCIIGenerator
+from writers import open_writer
+from kernels import get_backend
 
 # Vérifier si rembg est disponible (même logique que generator.py)
 try:
@@ -28,10 +30,14 @@ class ASCIIGeneratorGUI:
         self.width = tk.IntVar(value=80)
         self.remove_background = tk.BooleanVar(value=False)
         
-        # Instance persistante du générateur pour optimiser le cache
+        # Dernier art ASCII généré (sauvegardé sans les statistiques affichées)
+        self.last_ascii_art = None
+        
+        # Instance persistante et partagée du générateur pour optimiser le cache
+        # (le style est passé à chaque génération, l'instance n'est jamais remplacée)
         self.generator = ASCIIGenerator(self.style.get())
         
-        # Trace pour mettre à jour le générateur quand le style change
+        # Trace pour journaliser les changements de style
         self.style.trace('w', self.on_style_change)
         
         # Log du statut de rembg au démarrage
@@ -42,25 +48,17 @@ class ASCIIGeneratorGUI:
         
         self.setup_ui()
         
+        # Compiler les noyaux en arrière-plan pour ne pas ralentir la première génération
+        threading.Thread(target=get_backend().warm_up, daemon=True).start()
+        
         # Nettoyer le cache à la fermeture
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
     def on_style_change(self, *args):
-        """Appelé quand le style change - recrée le générateur."""
+        """Appelé quand le style change - pris en compte à la prochaine génération."""
         new_style = self.style.get()
         logger.info(f"Changement de style vers: {new_style}")
         
-        # Conserver le cache de l'image actuelle
-        old_generator = self.generator
-        self.generator = ASCIIGenerator(new_style)
-        
-        # Transférer le cache si possible
-        if hasattr(old_generator, '_last_image_path') and old_generator._last_image_path:
-            self.generator._last_image_path = old_generator._last_image_path
-            self.generator._original_image = old_generator._original_image
-            self.generator._no_bg_image = old_generator._no_bg_image
-            logger.debug("Cache d'image transféré vers le nouveau générateur")
-        
     def setup_ui(self):
         """Configure l'interface utilisateur."""
         # Frame principal
@@ -94,7 +92,7 @@ class ASCIIGeneratorGUI:
         ttk.Label(main_frame, text="Style:").grid(row=2, column=0, sticky=tk.W, pady=5)
         
         style_combo = ttk.Combobox(main_frame, textvariable=self.style, 
-                                  values=list(ASCIIGenerator.ASCII_CHARS.keys()),
+                                  values=list(ASCIIGenerator.ASCII_CHARS.keys()) + list(ASCIIGenerator.SUBCELL_MODES.keys()),
                                   state="readonly", width=15)
         style_combo.grid(row=2, column=1, sticky=tk.W, pady=5)
         
@@ -266,7 +264,8 @@ class ASCIIGeneratorGUI:
             'simple': "Rapide, moins de détails",
             'standard': "Bon équilibre qualité/vitesse",
             'detailed': "Maximum de détails, plus lent",
-            'blocks': "Style pixel art"
+            'blocks': "Style pixel art",
+            'braille': "Braille 2x4, résolution x8"
         }
         desc = descriptions.get(self.style.get(), "")
         self.style_desc.config(text=desc)
@@ -354,8 +353,16 @@ class ASCIIGeneratorGUI:
         # Affichage initial de la progression
         self.show_progress("Initialisation", "Préparation de la génération ASCII...")
         
+        # Lire les paramètres dans le thread principal (tkinter n'est pas thread-safe)
+        params = {
+            'image_path': self.image_path.get(),
+            'width': self.width.get(),
+            'remove_bg': self.remove_background.get(),
+            'ascii_chars': self.style.get()
+        }
+        
         # Lancer dans un thread pour éviter de bloquer l'interface
-        thread = threading.Thread(target=self._generate_ascii_thread)
+        thread = threading.Thread(target=self._generate_ascii_thread, args=(params,))
         thread.daemon = True
         thread.start()
     
@@ -387,30 +394,32 @@ Veuillez patienter pendant le traitement...
         # Programmer la mise à jour dans le thread principal
         self.root.after(0, _update)
         
-    def _generate_ascii_thread(self):
+    def _generate_ascii_thread(self, params):
         """Thread de génération ASCII avec générateur persistant et progression."""
         try:
             # Utiliser l'instance persistante du générateur avec callback de progression
             ascii_art = self.generator.generate_ascii(
-                self.image_path.get(), 
-                width=self.width.get(),
-                remove_bg=self.remove_background.get(),
-                progress_callback=self.update_progress
+                params['image_path'],
+                width=params['width'],
+                remove_bg=params['remove_bg'],
+                progress_callback=self.update_progress,
+                ascii_chars=params['ascii_chars']
             )
             
             # Mettre à jour l'interface dans le thread principal
-            self.root.after(0, self._update_result, ascii_art)
+            self.root.after(0, self._update_result, ascii_art, params)
             
         except Exception as e:
             error_msg = f"Erreur lors de la génération: {str(e)}"
             logger.error(error_msg)
             self.root.after(0, self._show_error, error_msg)
     
-    def _update_result(self, ascii_art):
+    def _update_result(self, ascii_art, params):
         """Met à jour le résultat dans l'interface (thread principal)."""
         self.generate_btn.config(state="normal", text="Générer ASCII")
         
         if ascii_art:
+            self.last_ascii_art = ascii_art
             self.result_text.delete(1.0, tk.END)
             self.result_text.insert(1.0, ascii_art)
             self.save_btn.config(state="normal")
@@ -419,16 +428,19 @@ Veuillez patienter pendant le traitement...
             # Statistiques avec informations de cache
             lines = len(ascii_art.split('\n'))
             chars = len(ascii_art)
-            style_name = self.style.get()
-            width = self.width.get()
-            bg_removed = "Oui" if self.remove_background.get() else "Non"
+            style_name = params['ascii_chars']
+            width = params['width']
+            bg_removed = "Oui" if params['remove_bg'] else "Non"
             
             # Informations de cache
             cache_info = []
-            if hasattr(self.generator, '_last_image_path') and self.generator._last_image_path:
+            generator_cache = self.generator.get_cache_info()
+            if generator_cache['image_path']:
                 cache_info.append("Image en cache")
-            if hasattr(self.generator, '_no_bg_image') and self.generator._no_bg_image is not None:
+            if generator_cache['no_bg_cached']:
                 cache_info.append("Arrière-plan en cache")
+            if generator_cache['pyramid_bytes']:
+                cache_info.append(f"Pyramide {generator_cache['pyramid_bytes'] / 1e6:.1f} Mo")
             
             cache_status = " | ".join(cache_info) if cache_info else "Nouveau traitement"
             
@@ -479,20 +491,21 @@ Sélectionnez une autre image ou réessayez.
         
     def save_result(self):
         """Sauvegarde le résultat ASCII."""
-        content = self.result_text.get(1.0, tk.END)
-        if not content.strip():
+        if not self.last_ascii_art:
             return
             
         filename = filedialog.asksaveasfilename(
             title="Sauvegarder l'art ASCII",
             defaultextension=".txt",
-            filetypes=[("Fichiers texte", "*.txt"), ("Tous les fichiers", "*.*")]
+            filetypes=[("Fichiers texte", "*.txt"), ("Texte compressé (gzip)", "*.txt.gz"),
+                       ("Tous les fichiers", "*.*")]
         )
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                # Compression choisie d'après l'extension (.gz, .zst)
+                with open_writer(filename) as writer:
+                    writer.write_text(self.last_ascii_art)
                 messagebox.showinfo("Succès", f"Art ASCII sauvegardé dans:\n{filename}")
             except Exception as e:
                 messagebox.showerror("Erreur", f"Erreur lors de la sauvegarde:\n{str(e)}")
@@ -526,6 +539,7 @@ Sélectionnez une autre image ou réessayez.
    • Standard   → Équilibre parfait qualité/vitesse
    • Detailed   → Maximum de détails et de nuances
    • Blocks     → Style pixel art moderne
+   • Braille    → 8 points par caractère, détails fins
 
  TAILLES RECOMMANDÉES :
    • 40-60      → Aperçus rapides, icônes
@@ -0,0 +1,327 @@
+"""
+Noyaux de calcul du pipeline de conversion : luminance, moyenne par cellule,
+quantification vers les caractères et tramage ordonné.
+
+Deux implémentations partagent la même interface et donnent des résultats
+identiques au bit près : NumPy (toujours disponible) et Numba (compilée,
+choisie automatiquement si Numba est installé). La variante Numba fusionne
+moyenne par cellule, luminance, quantification et écriture des caractères
+en une seule passe, sans tableau intermédiaire.
+
+Utilisation : generate_ascii passe par quantize (Palette.map_pixels) et
+ordered_dither (Braille) ; son redimensionnement reste celui de PIL depuis la
+pyramide en niveaux de gris. Le rendu fusionné (render, cell_average, luma)
+sert au rendu temps réel.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger.logger import logger
+import numpy as np
+
+# Import conditionnel pour le backend compilé
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Coefficients de luminance ITU-R 601 en virgule fixe 16 bits (identiques à PIL 'L')
+LUMA_R, LUMA_G, LUMA_B = 19595, 38470, 7471
+
+# Matrice de Bayer 4x4 ramenée à des seuils 0-255 (un point est allumé si pixel > seuil)
+BAYER_4X4 = (np.array([[0, 8, 2, 10],
+                       [12, 4, 14, 6],
+                       [3, 11, 1, 9],
+                       [15, 7, 13, 5]], dtype=np.float32) + 0.5) * (255.0 / 16.0)
+
+def _cell_bounds(size, cells):
+    """Début de chaque cellule le long d'un axe (découpage entier, comme les noyaux compilés)."""
+    return (np.arange(cells, dtype=np.int64) * size) // cells
+
+class NumpyKernels:
+    """Noyaux en NumPy pur, étape par étape."""
+    
+    name = 'numpy'
+    
+    def luma(self, rgb):
+        """
+        Convertit une image RGB en niveaux de gris.
+        
+        Args:
+            rgb (numpy.ndarray): Tableau HxWx3 uint8
+        
+        Returns:
+            numpy.ndarray: Tableau HxW uint8
+        """
+        rgb = rgb.astype(np.uint32)
+        gray = rgb[..., 0] * LUMA_R
+        gray += rgb[..., 1] * LUMA_G
+        gray += rgb[..., 2] * LUMA_B
+        gray += 0x8000
+        gray >>= 16
+        return gray.astype(np.uint8)
+    
+    def cell_average(self, gray, height, width):
+        """
+        Réduit une image en niveaux de gris par moyenne sur des cellules rectangulaires.
+        
+        Args:
+            gray (numpy.ndarray): Tableau HxW uint8 (ou HxWx3, converti en luminance)
+            height (int): Nombre de cellules verticales
+            width (int): Nombre de cellules horizontales
+        
+        Returns:
+            numpy.ndarray: Tableau height x width uint8 (moyennes arrondies)
+        """
+        if gray.ndim == 3:
+            gray = self.luma(gray)
+        rows = _cell_bounds(gray.shape[0], height)
+        cols = _cell_bounds(gray.shape[1], width)
+        
+        sums = np.add.reduceat(np.add.reduceat(gray, rows, axis=0, dtype=np.uint64), cols, axis=1)
+        row_counts = np.maximum(np.diff(rows, append=gray.shape[0]), 1)
+        col_counts = np.maximum(np.diff(cols, append=gray.shape[1]), 1)
+        counts = (row_counts[:, None] * col_counts[None, :]).astype(np.uint64)
+        
+        return ((sums + counts // 2) // counts).astype(np.uint8)
+    
+    def quantize(self, gray, codes, out=None):
+        """
+        Remplace chaque niveau de gris par le point de code de la palette.
+        
+        Args:
+            gray (numpy.ndarray): Tableau 2D uint8
+            codes (numpy.ndarray): Table de 256 points de code (Palette.codes)
+            out (numpy.ndarray): Tableau uint32 de sortie préalloué (optionnel)
+        
+        Returns:
+            numpy.ndarray: Tableau 2D uint32 de points de code
+        """
+        return np.take(codes, gray, out=out)
+    
+    def ordered_dither(self, gray):
+        """
+        Binarise une image par tramage ordonné (Bayer 4x4).
+        
+        Args:
+            gray (numpy.ndarray): Tableau 2D uint8
+        
+        Returns:
+            numpy.ndarray: Tableau 2D booléen (True pour un point allumé)
+        """
+        height, width = gray.shape
+        thresholds = np.tile(BAYER_4X4, (-(-height // 4), -(-width // 4)))
+        return gray > thresholds[:height, :width]
+    
+    def render(self, pixels, height, width, codes, out=None):
+        """
+        Pipeline complet : luminance (si RGB), moyenne par cellule et quantification.
+        
+        Args:
+            pixels (numpy.ndarray): Tableau HxW ou HxWx3 uint8
+            height (int): Nombre de lignes de sortie
+            width (int): Nombre de caractères par ligne
+            codes (numpy.ndarray): Table de 256 points de code
+            out (numpy.ndarray): Tableau height x width uint32 préalloué (optionnel)
+        
+        Returns:
+            numpy.ndarray: Tableau height x width uint32 de points de code
+        """
+        return self.quantize(self.cell_average(pixels, height, width), codes, out)
+    
+    def warm_up(self):
+        """Rien à préparer pour NumPy."""
+        pass
+
+if NUMBA_AVAILABLE:
+    
+    # Sommes calculées en int64 : mélanger entiers signés et non signés ferait
+    # passer Numba en flottants
+    
+    @njit(cache=True, nogil=True)
+    def _luma_pixel(pixels, y, x):
+        return (np.int64(pixels[y, x, 0]) * LUMA_R + np.int64(pixels[y, x, 1]) * LUMA_G
+                + np.int64(pixels[y, x, 2]) * LUMA_B + 0x8000) >> 16
+    
+    @njit(cache=True, nogil=True)
+    def _luma_numba(rgb, out):
+        for y in range(rgb.shape[0]):
+            for x in range(rgb.shape[1]):
+                out[y, x] = _luma_pixel(rgb, y, x)
+    
+    @njit(cache=True, nogil=True)
+    def _cell_sum_rgb(pixels, y0, y1, x0, x1):
+        total = 0
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                total += _luma_pixel(pixels, y, x)
+        return total
+    
+    @njit(cache=True, nogil=True)
+    def _cell_sum_gray(pixels, y0, y1, x0, x1):
+        total = 0
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                total += np.int64(pixels[y, x])
+        return total
+    
+    @njit(cache=True, nogil=True)
+    def _cell_average_rgb(pixels, out):
+        in_height, in_width = pixels.shape[0], pixels.shape[1]
+        height, width = out.shape
+        for i in range(height):
+            y0 = i * in_height // height
+            y1 = max((i + 1) * in_height // height, y0 + 1)
+            for j in range(width):
+                x0 = j * in_width // width
+                x1 = max((j + 1) * in_width // width, x0 + 1)
+                count = (y1 - y0) * (x1 - x0)
+                out[i, j] = (_cell_sum_rgb(pixels, y0, y1, x0, x1) + count // 2) // count
+    
+    @njit(cache=True, nogil=True)
+    def _render_rgb(pixels, codes, out):
+        # Passe unique : moyenne de la cellule, luminance, quantification et écriture du caractère
+        in_height, in_width = pixels.shape[0], pixels.shape[1]
+        height, width = out.shape
+        for i in range(height):
+            y0 = i * in_height // height
+            y1 = max((i + 1) * in_height // height, y0 + 1)
+            for j in range(width):
+                x0 = j * in_width // width
+                x1 = max((j + 1) * in_width // width, x0 + 1)
+                count = (y1 - y0) * (x1 - x0)
+                out[i, j] = codes[(_cell_sum_rgb(pixels, y0, y1, x0, x1) + count // 2) // count]
+    
+    @njit(cache=True, nogil=True)
+    def _cell_average_gray(pixels, out):
+        in_height, in_width = pixels.shape[0], pixels.shape[1]
+        height, width = out.shape
+        for i in range(height):
+            y0 = i * in_height // height
+            y1 = max((i + 1) * in_height // height, y0 + 1)
+            for j in range(width):
+                x0 = j * in_width // width
+                x1 = max((j + 1) * in_width // width, x0 + 1)
+                count = (y1 - y0) * (x1 - x0)
+                out[i, j] = (_cell_sum_gray(pixels, y0, y1, x0, x1) + count // 2) // count
+    
+    @njit(cache=True, nogil=True)
+    def _render_gray(pixels, codes, out):
+        # Passe unique : moyenne de la cellule, quantification et écriture du caractère
+        in_height, in_width = pixels.shape[0], pixels.shape[1]
+        height, width = out.shape
+        for i in range(height):
+            y0 = i * in_height // height
+            y1 = max((i + 1) * in_height // height, y0 + 1)
+            for j in range(width):
+                x0 = j * in_width // width
+                x1 = max((j + 1) * in_width // width, x0 + 1)
+                count = (y1 - y0) * (x1 - x0)
+                out[i, j] = codes[(_cell_sum_gray(pixels, y0, y1, x0, x1) + count // 2) // count]
+    
+    @njit(cache=True, nogil=True)
+    def _quantize_numba(gray, codes, out):
+        for y in range(gray.shape[0]):
+            for x in range(gray.shape[1]):
+                out[y, x] = codes[gray[y, x]]
+    
+    @njit(cache=True, nogil=True)
+    def _ordered_dither_numba(gray, thresholds, out):
+        for y in range(gray.shape[0]):
+            for x in range(gray.shape[1]):
+                out[y, x] = gray[y, x] > thresholds[y & 3, x & 3]
+
+class NumbaKernels:
+    """Noyaux compilés par Numba, avec une passe fusionnée pour le rendu."""
+    
+    name = 'numba'
+    
+    def __init__(self):
+        if not NUMBA_AVAILABLE:
+            raise RuntimeError("Numba non disponible - Installer avec 'pip install numba'")
+        self._warmed_up = False
+    
+    def luma(self, rgb):
+        out = np.empty(rgb.shape[:2], dtype=np.uint8)
+        _luma_numba(np.ascontiguousarray(rgb), out)
+        return out
+    
+    def cell_average(self, gray, height, width):
+        out = np.empty((height, width), dtype=np.uint8)
+        kernel = _cell_average_rgb if gray.ndim == 3 else _cell_average_gray
+        kernel(np.ascontiguousarray(gray), out)
+        return out
+    
+    def quantize(self, gray, codes, out=None):
+        if out is None:
+            out = np.empty(gray.shape, dtype=np.uint32)
+        _quantize_numba(np.ascontiguousarray(gray), codes, out)
+        return out
+    
+    def ordered_dither(self, gray):
+        out = np.empty(gray.shape, dtype=np.bool_)
+        _ordered_dither_numba(np.ascontiguousarray(gray), BAYER_4X4, out)
+        return out
+    
+    def render(self, pixels, height, width, codes, out=None):
+        if out is None:
+            out = np.empty((height, width), dtype=np.uint32)
+        kernel = _render_rgb if pixels.ndim == 3 else _render_gray
+        kernel(np.ascontiguousarray(pixels), codes, out)
+        return out
+    
+    def warm_up(self):
+        """
+        Compile tous les noyaux sur de petites entrées pour que le temps de
+        compilation ne pèse pas sur la première conversion.
+        """
+        if self._warmed_up:
+            return
+        codes = np.arange(256, dtype=np.uint32)
+        # Numba compile une variante par état d'écriture : les tableaux issus
+        # de np.asarray(image PIL) sont en lecture seule
+        for writeable in (True, False):
+            rgb = np.zeros((8, 8, 3), dtype=np.uint8)
+            gray = np.zeros((8, 8), dtype=np.uint8)
+            rgb.setflags(write=writeable)
+            gray.setflags(write=writeable)
+            self.luma(rgb)
+            self.cell_average(gray, 2, 2)
+            self.cell_average(rgb, 2, 2)
+            self.quantize(gray, codes)
+            self.ordered_dither(gray)
+            self.render(gray, 2, 2, codes)
+            self.render(rgb, 2, 2, codes)
+        self._warmed_up = True
+        logger.debug("Noyaux Numba compilés")
+
+_BACKENDS = {}
+
+def get_backend(name=None):
+    """
+    Retourne une implémentation des noyaux.
+    
+    Args:
+        name (str): 'numpy', 'numba' ou None (Numba si installé, NumPy sinon)
+    
+    Returns:
+        NumpyKernels | NumbaKernels: Noyaux partagés
+    """
+    if name is None:
+        name = 'numba' if NUMBA_AVAILABLE else 'numpy'
+    if name not in _BACKENDS:
+        if name == 'numba':
+            _BACKENDS[name] = NumbaKernels()
+        elif name == 'numpy':
+            _BACKENDS[name] = NumpyKernels()
+        else:
+            raise ValueError(f"Backend de noyaux inconnu: {name}")
+        logger.info(f"Backend de noyaux: {name}")
+    return _BACKENDS[name]
+
+def available_backends():
+    """Liste des backends utilisables dans cet environnement."""
+    return ['numpy', 'numba'] if NUMBA_AVAILABLE else ['numpy']
@@ -0,0 +1,260 @@
+"""
+Profilage mémoire de generate_ascii.
+
+tracemalloc détaille les allocations Python et NumPy par étape, mais ne voit
+pas les tampons internes des images PIL. Le budget porte donc sur le pic de
+mémoire résidente (RSS) de la conversion, mesuré dans un processus neuf, qui
+compte toutes les allocations, PIL comprises.
+"""
+
+import sys
+import os
+import gc
+import subprocess
+import tempfile
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger.logger import logger
+from PIL import Image
+import numpy as np
+
+from generator import ASCIIGenerator
+from kernels import get_backend
+
+# Import conditionnel (absent sous Windows)
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Image de référence et budgets de la conversion à froid
+REFERENCE_SIZE = (4000, 3000)
+REFERENCE_WIDTH = 200
+# Pic RSS : image RGB décodée (36 Mo, gardée en cache), niveaux de gris et
+# pyramide (~28 Mo), plus une marge inférieure à une copie supplémentaire de l'image
+PEAK_RSS_BUDGET = 90 * 1024 * 1024
+# Pic tracemalloc (Python et NumPy) : la pyramide en cache (~16 Mo) plus une marge
+PEAK_BUDGET = 20 * 1024 * 1024
+
+# Préfixe de la ligne par laquelle le processus de mesure rend son résultat
+_RSS_RESULT_PREFIX = "PEAK_RSS="
+
+def make_reference_image(path, size=REFERENCE_SIZE):
+    """
+    Crée une image de test déterministe (dégradés colorés).
+    
+    Args:
+        path (str): Chemin du fichier à créer (format déduit de l'extension)
+        size (tuple): Taille (largeur, hauteur) en pixels
+    
+    Returns:
+        str: Chemin du fichier créé
+    """
+    width, height = size
+    x = np.arange(width, dtype=np.uint32)[None, :]
+    y = np.arange(height, dtype=np.uint32)[:, None]
+    rgb = np.empty((height, width, 3), dtype=np.uint8)
+    rgb[..., 0] = (x * 255 // max(width - 1, 1)).astype(np.uint8)
+    rgb[..., 1] = (y * 255 // max(height - 1, 1)).astype(np.uint8)
+    rgb[..., 2] = ((x + y) % 256).astype(np.uint8)
+    Image.fromarray(rgb).save(path)
+    return path
+
+def _pil_nbytes(image):
+    """Taille approximative du tampon d'une image PIL."""
+    if image is None:
+        return 0
+    return image.width * image.height * len(image.getbands())
+
+def profile_generate_ascii(image_path, width=REFERENCE_WIDTH, ascii_chars=None, remove_bg=False, generator=None):
+    """
+    Mesure les allocations de generate_ascii, étape par étape.
+    
+    Les étapes sont délimitées par les appels de progression de generate_ascii.
+    Les noyaux sont compilés (ou chargés depuis le cache Numba) avant la mesure :
+    ce coût unique n'est pas lié à l'image.
+    
+    Args:
+        image_path (str): Chemin vers l'image source
+        width (int): Largeur en caractères
+        ascii_chars (str): Palette ou mode sous-cellule
+        remove_bg (bool): Supprimer l'arrière-plan avant conversion
+        generator (ASCIIGenerator): Générateur à utiliser (nouvelle instance si None,
+                                    donc mesure à froid)
+    
+    Returns:
+        dict: 'peak' (pic tracemalloc en octets), 'retained' (octets encore alloués
+              à la fin), 'stages' (liste de (étape, pic de l'étape, alloué en fin d'étape))
+              et 'pil_cache_bytes' (tampons PIL conservés dans le cache)
+    """
+    generator = generator or ASCIIGenerator()
+    get_backend().warm_up()
+    stages = []
+    current_stage = ["Démarrage"]
+    
+    def on_progress(step, details=""):
+        current, peak = tracemalloc.get_traced_memory()
+        stages.append((current_stage[0], peak, current))
+        current_stage[0] = step
+        tracemalloc.reset_peak()
+    
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.clear_traces()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        ascii_art = generator.generate_ascii(image_path, width=width, remove_bg=remove_bg,
+                                             progress_callback=on_progress, ascii_chars=ascii_chars)
+        on_progress("Fin")
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+        del ascii_art
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    
+    stages = [(name, peak - baseline, current - baseline) for name, peak, current in stages]
+    snapshot = generator._snapshot
+    return {
+        'peak': max(peak for _, peak, _ in stages),
+        'retained': retained,
+        'stages': stages,
+        'pil_cache_bytes': _pil_nbytes(snapshot.original_image) + _pil_nbytes(snapshot.no_bg_image)
+    }
+
+def _read_status(field):
+    """Valeur en octets d'un champ de /proc/self/status (ex: 'VmRSS'), None si indisponible."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def _reset_peak_rss():
+    """
+    Remet à zéro le pic RSS du processus quand le noyau le permet (Linux).
+    
+    Returns:
+        int: Mémoire résidente servant de référence (pic courant si la remise à zéro échoue)
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return _read_status('VmRSS')
+    except OSError:
+        # Le pic ne peut que croître : la référence est le pic déjà atteint
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _peak_rss():
+    """Pic RSS du processus en octets."""
+    peak = _read_status('VmHWM')
+    if peak is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return peak
+
+def _measure_rss_in_process(image_path, width, ascii_chars=None, remove_bg=False):
+    """Mesure le pic RSS d'une conversion dans le processus courant (voir measure_peak_rss)."""
+    generator = ASCIIGenerator()
+    get_backend().warm_up()
+    gc.collect()
+    baseline = _reset_peak_rss()
+    generator.generate_ascii(image_path, width=width, remove_bg=remove_bg, ascii_chars=ascii_chars)
+    return _peak_rss() - baseline
+
+def measure_peak_rss(image_path, width=REFERENCE_WIDTH, ascii_chars=None, remove_bg=False):
+    """
+    Mesure le pic de mémoire résidente d'une conversion à froid, allocations
+    PIL comprises, dans un processus neuf (imports et noyaux prêts avant la mesure).
+    
+    Args:
+        image_path (str): Chemin vers l'image source
+        width (int): Largeur en caractères
+        ascii_chars (str): Palette ou mode sous-cellule
+        remove_bg (bool): Supprimer l'arrière-plan avant conversion
+    
+    Returns:
+        int: Augmentation du pic RSS en octets, None si la mesure est impossible
+    """
+    if not RESOURCE_AVAILABLE:
+        logger.warning("Module resource indisponible - Mesure du pic RSS ignorée")
+        return None
+    
+    command = [sys.executable, os.path.abspath(__file__), '--rss', image_path, str(width),
+               ascii_chars or '', '1' if remove_bg else '']
+    completed = subprocess.run(command, capture_output=True, text=True)
+    for line in completed.stdout.splitlines():
+        if line.startswith(_RSS_RESULT_PREFIX):
+            return int(line[len(_RSS_RESULT_PREFIX):])
+    logger.error(f"Échec de la mesure du pic RSS: {completed.stderr.strip()[-500:]}")
+    return None
+
+def report(profile):
+    """
+    Journalise un profil mémoire.
+    
+    Args:
+        profile (dict): Résultat de profile_generate_ascii
+    """
+    for name, peak, current in profile['stages']:
+        logger.info(f"{name:<30} pic {peak / 1e6:8.2f} Mo | alloué {current / 1e6:8.2f} Mo")
+    logger.info(f"Pic total (tracemalloc): {profile['peak'] / 1e6:.2f} Mo")
+    logger.info(f"Conservé après génération: {profile['retained'] / 1e6:.2f} Mo")
+    logger.info(f"Images PIL en cache (hors tracemalloc): {profile['pil_cache_bytes'] / 1e6:.2f} Mo")
+
+def check_memory_budget(rss_budget=PEAK_RSS_BUDGET, budget=PEAK_BUDGET, width=REFERENCE_WIDTH, ascii_chars=None):
+    """
+    Vérifie que la conversion de l'image de référence (4000x3000, largeur 200)
+    respecte les budgets : pic RSS à froid (toutes allocations, PIL comprises)
+    et pic tracemalloc à froid puis avec le cache.
+    
+    Args:
+        rss_budget (int): Augmentation maximale du pic RSS en octets
+        budget (int): Pic tracemalloc maximal en octets
+        width (int): Largeur en caractères
+        ascii_chars (str): Palette ou mode sous-cellule
+    
+    Returns:
+        bool: True si toutes les mesures respectent leur budget
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_reference_image(os.path.join(directory, 'reference.png'))
+        within_budget = True
+        
+        peak_rss = measure_peak_rss(path, width=width, ascii_chars=ascii_chars)
+        if peak_rss is not None:
+            logger.info(f"Pic RSS à froid (PIL compris): {peak_rss / 1e6:.2f} Mo")
+            if peak_rss > rss_budget:
+                logger.error(f"Budget RSS dépassé: {peak_rss / 1e6:.2f} Mo > {rss_budget / 1e6:.2f} Mo")
+                within_budget = False
+        
+        generator = ASCIIGenerator()
+        for label in ("à froid", "avec cache"):
+            profile = profile_generate_ascii(path, width=width, ascii_chars=ascii_chars, generator=generator)
+            logger.info(f"--- Profil {label} ---")
+            report(profile)
+            if profile['peak'] > budget:
+                logger.error(f"Budget mémoire dépassé ({label}): {profile['peak'] / 1e6:.2f} Mo "
+                             f"> {budget / 1e6:.2f} Mo")
+                within_budget = False
+        return within_budget
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--rss':
+        # Processus de mesure lancé par measure_peak_rss
+        image_arg, width_arg = sys.argv[2], int(sys.argv[3])
+        chars_arg = sys.argv[4] if len(sys.argv) > 4 and sys.argv[4] else None
+        remove_bg_arg = len(sys.argv) > 5 and bool(sys.argv[5])
+        print(f"{_RSS_RESULT_PREFIX}{_measure_rss_in_process(image_arg, width_arg, chars_arg, remove_bg_arg)}")
+    elif len(sys.argv) > 1:
+        report(profile_generate_ascii(sys.argv[1]))
+        peak_rss = measure_peak_rss(sys.argv[1])
+        if peak_rss is not None:
+            logger.info(f"Pic RSS à froid (PIL compris): {peak_rss / 1e6:.2f} Mo")
+    else:
+        sys.exit(0 if check_memory_budget() else 1)
@@ -0,0 +1,314 @@
+import sys
+import os
+import json
+import hashlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger.logger import logger
+from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+
+from kernels import get_backend
+
+# Jeu de blocs Unicode prêt à être calibré (nécessite une police qui le couvre)
+BLOCK_CHARS = " ▏▎▍▌▋▊▉█░▒▓▀▄▖▗▘▝▚▞▙▛▜▟"
+
+# Caractères Braille : U+2800 + motif de 8 bits, un caractère pour 2x4 pixels (largeur, hauteur)
+BRAILLE_BASE = 0x2800
+BRAILLE_CELL = (2, 4)
+BRAILLE_CHARS = ''.join(chr(BRAILLE_BASE + i) for i in range(256))
+# Position (ligne, colonne) dans la cellule de chacun des 8 bits, norme Unicode
+_BRAILLE_DOTS = ((0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1), (3, 0), (3, 1))
+
+# Point de code jamais attribué : sa forme est celle du glyphe de remplacement (.notdef) de la police
+NOTDEF_CHAR = '\U0010FFFF'
+
+# Dossier par défaut des tables calibrées
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ascii_generator", "palettes")
+
+class Palette:
+    """
+    Palette de caractères ordonnée du plus sombre au plus clair, accompagnée
+    de sa table de correspondance niveau de gris -> caractère.
+    """
+    
+    def __init__(self, chars, lut):
+        """
+        Initialise la palette.
+        
+        Args:
+            chars (str): Caractères ordonnés du plus sombre au plus clair
+            lut (numpy.ndarray): 256 indices dans chars, un par niveau de gris
+        """
+        self.chars = chars
+        self.lut = np.asarray(lut, dtype=np.uint16)
+        
+        # Table directe niveau de gris -> point de code, pour une seule indexation au rendu
+        codepoints = np.array([ord(char) for char in chars], dtype=np.uint32)
+        self.codes = codepoints[self.lut]
+    
+    @classmethod
+    def linear(cls, chars):
+        """
+        Crée une palette dont les caractères sont répartis uniformément sur
+        les niveaux de gris (comportement historique du générateur).
+        
+        Args:
+            chars (str): Caractères ordonnés du plus sombre au plus clair
+        
+        Returns:
+            Palette: Palette linéaire
+        """
+        lut = np.arange(256, dtype=np.int64) * (len(chars) - 1) // 255
+        return cls(chars, lut)
+    
+    def map_pixels(self, pixels):
+        """
+        Convertit un tableau de niveaux de gris en lignes de texte.
+        
+        Args:
+            pixels (numpy.ndarray): Tableau 2D uint8
+        
+        Returns:
+            list: Liste de chaînes (une par ligne)
+        """
+        return codes_to_lines(get_backend().quantize(pixels, self.codes))
+
+def codes_to_lines(codes):
+    """
+    Convertit un tableau 2D de points de code en lignes de texte.
+    
+    Args:
+        codes (numpy.ndarray): Tableau 2D de points de code
+    
+    Returns:
+        list: Liste de chaînes (une par ligne)
+    """
+    codes = np.ascontiguousarray(codes, dtype=np.uint32)
+    height, width = codes.shape
+    if width == 0:
+        return [''] * height
+    # Chaque ligne de points de code est relue directement comme une chaîne UTF-32
+    return codes.view(f'<U{width}')[:, 0].tolist()
+
+def braille_codes(pixels, dither=True, threshold=127):
+    """
+    Convertit un tableau de niveaux de gris en points de code Braille, chaque
+    caractère représentant un bloc de 2x4 pixels.
+    
+    Args:
+        pixels (numpy.ndarray): Tableau 2D uint8 (dimensions multiples de 4 en hauteur et 2 en largeur)
+        dither (bool): Tramage ordonné (Bayer 4x4) plutôt que seuil fixe
+        threshold (int): Seuil d'allumage d'un point sans tramage (pixel strictement supérieur)
+    
+    Returns:
+        numpy.ndarray: Tableau 2D uint32 de points de code (une rangée par ligne de caractères)
+    """
+    cell_width, cell_height = BRAILLE_CELL
+    rows = pixels.shape[0] // cell_height
+    cols = pixels.shape[1] // cell_width
+    pixels = pixels[:rows * cell_height, :cols * cell_width]
+    
+    # Un point est allumé sur les pixels clairs, comme les caractères denses des palettes
+    if dither:
+        dots = get_backend().ordered_dither(pixels)
+    else:
+        dots = pixels > threshold
+    
+    # Chaque position de point est traitée sur tout le tableau à la fois
+    # (8 tranches strided), sans boucle par cellule
+    values = np.zeros((rows, cols), dtype=np.uint8)
+    for bit, (row, col) in enumerate(_BRAILLE_DOTS):
+        values |= dots[row::cell_height, col::cell_width].view(np.uint8) << bit
+    
+    return values.astype(np.uint32) + BRAILLE_BASE
+
+def pixels_to_braille(pixels, dither=True, threshold=127):
+    """
+    Convertit un tableau de niveaux de gris en lignes de caractères Braille.
+    
+    Args:
+        pixels (numpy.ndarray): Tableau 2D uint8
+        dither (bool): Tramage ordonné (Bayer 4x4) plutôt que seuil fixe
+        threshold (int): Seuil d'allumage d'un point sans tramage
+    
+    Returns:
+        list: Liste de chaînes (une par ligne de caractères)
+    """
+    return codes_to_lines(braille_codes(pixels, dither, threshold))
+
+def _load_font(font_path, font_size):
+    """Charge la police de calibration (police par défaut de PIL si aucun chemin)."""
+    if font_path is None:
+        return ImageFont.load_default(size=font_size)
+    return ImageFont.truetype(font_path, font_size)
+
+def _cache_key(chars, font_path, font_size, levels):
+    """Construit la clé de cache d'une calibration à partir de la police et de la palette."""
+    font_id = 'default'
+    if font_path is not None:
+        stat = os.stat(font_path)
+        font_id = f"{os.path.abspath(font_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+    key = json.dumps([chars, font_id, font_size, levels], ensure_ascii=False)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def find_missing_glyphs(chars, font_path=None, font_size=24):
+    """
+    Détecte les caractères que la police ne couvre pas : leur rendu est
+    identique à celui du glyphe de remplacement (.notdef).
+    
+    Args:
+        chars (str): Caractères à vérifier
+        font_path (str): Police TrueType (police par défaut de PIL si None)
+        font_size (int): Taille de rendu en pixels
+    
+    Returns:
+        str: Caractères absents de la police (dans l'ordre fourni)
+    """
+    font = _load_font(font_path, font_size)
+    
+    notdef = font.getmask(NOTDEF_CHAR)
+    if notdef.getbbox() is None:
+        # Glyphe de remplacement vide : impossible de le distinguer d'un espace
+        logger.debug("Glyphe de remplacement vide - Détection des caractères absents impossible")
+        return ''
+    notdef_key = (notdef.size, bytes(notdef))
+    
+    missing = []
+    for char in chars:
+        mask = font.getmask(char)
+        if (mask.size, bytes(mask)) == notdef_key:
+            missing.append(char)
+    return ''.join(missing)
+
+def measure_ink(chars, font_path=None, font_size=24):
+    """
+    Mesure la densité d'encre de chaque caractère en le dessinant avec une police.
+    
+    Args:
+        chars (str): Caractères à mesurer
+        font_path (str): Police TrueType (police par défaut de PIL si None)
+        font_size (int): Taille de rendu en pixels
+    
+    Returns:
+        numpy.ndarray: Fraction de pixels allumés dans la cellule de chaque caractère
+    """
+    font = _load_font(font_path, font_size)
+    
+    # Cellule commune à tous les caractères, comme dans un terminal à chasse fixe
+    boxes = [font.getbbox(char) for char in chars]
+    left = min(min(box[0] for box in boxes), 0)
+    top = min(min(box[1] for box in boxes), 0)
+    width = max(max(box[2] for box in boxes), int(max(font.getlength(char) for char in chars))) - left
+    height = max(box[3] for box in boxes) - top
+    width, height = max(width, 1), max(height, 1)
+    
+    densities = np.empty(len(chars), dtype=np.float64)
+    for i, char in enumerate(chars):
+        cell = Image.new('L', (width, height), 0)
+        ImageDraw.Draw(cell).text((-left, -top), char, fill=255, font=font)
+        densities[i] = np.asarray(cell, dtype=np.float64).mean() / 255.0
+    return densities
+
+def _resample_indices(normalized, levels):
+    """Indices des caractères les plus proches de levels niveaux répartis uniformément."""
+    targets = np.linspace(0.0, 1.0, levels)
+    return np.unique(np.abs(normalized[None, :] - targets[:, None]).argmin(axis=1))
+
+def _calibrate(chars, font_path, font_size, levels):
+    """
+    Trie les caractères par densité, les rééchantillonne et construit la table.
+    
+    Returns:
+        tuple: (caractères, table, True si les densités mesurées ont servi ;
+                False pour la répartition linéaire de repli)
+    
+    Raises:
+        ValueError: Si la police ne couvre pas certains caractères
+    """
+    missing = find_missing_glyphs(chars, font_path, font_size)
+    if missing:
+        raise ValueError(f"Caractères absents de la police ({len(missing)}): {missing[:20]} - "
+                         f"Utiliser une police qui les couvre (font_path) ou calibrate=False")
+    
+    densities = measure_ink(chars, font_path, font_size)
+    
+    # Tri stable : à densité égale, l'ordre fourni par l'utilisateur est conservé
+    order = np.argsort(densities, kind='stable')
+    chars = ''.join(chars[i] for i in order)
+    densities = densities[order]
+    
+    span = densities[-1] - densities[0]
+    if span <= 0:
+        logger.warning("Densités identiques pour tous les caractères - Répartition linéaire utilisée")
+        # Rééchantillonnage sur la position, faute de densités exploitables
+        if levels is not None and levels < len(chars):
+            picked = _resample_indices(np.linspace(0.0, 1.0, len(chars)), levels)
+            chars = ''.join(chars[i] for i in picked)
+        return chars, Palette.linear(chars).lut, False
+    normalized = (densities - densities[0]) / span
+    
+    # Rééchantillonnage : caractère le plus proche de chaque niveau cible
+    if levels is not None and levels < len(chars):
+        picked = _resample_indices(normalized, levels)
+        chars = ''.join(chars[i] for i in picked)
+        normalized = normalized[picked]
+    
+    # Chaque niveau de gris prend le caractère de densité la plus proche
+    midpoints = (normalized[1:] + normalized[:-1]) / 2
+    lut = np.searchsorted(midpoints, np.arange(256) / 255.0)
+    return chars, lut, True
+
+def calibrate_palette(chars, font_path=None, font_size=24, levels=None, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Calibre une palette d'après la densité d'encre réelle de ses caractères.
+    
+    Le résultat est mis en cache sur disque, indexé par la police et la palette.
+    
+    Args:
+        chars (str): Caractères de la palette (dans un ordre quelconque)
+        font_path (str): Police TrueType utilisée pour le rendu (police par défaut de PIL si None)
+        font_size (int): Taille de rendu en pixels
+        levels (int): Nombre de niveaux à conserver (tous les caractères si None)
+        cache_dir (str): Dossier du cache disque (désactivé si None)
+    
+    Returns:
+        Palette: Palette calibrée
+    
+    Raises:
+        ValueError: Palette vide, levels inférieur à 1, ou caractères absents de la police
+    """
+    # Doublons supprimés en conservant le premier exemplaire
+    chars = ''.join(dict.fromkeys(chars))
+    if not chars:
+        raise ValueError("La palette doit contenir au moins un caractère")
+    if levels is not None and levels < 1:
+        raise ValueError("levels doit être supérieur ou égal à 1")
+    
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, _cache_key(chars, font_path, font_size, levels) + '.json')
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            logger.debug(f"Palette calibrée chargée depuis le cache: {cache_path}")
+            return Palette(cached['chars'], cached['lut'])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Cache de palette illisible, recalibration: {e}")
+    
+    logger.info(f"Calibration d'une palette de {len(chars)} caractères...")
+    calibrated_chars, lut, measured = _calibrate(chars, font_path, font_size, levels)
+    
+    # La répartition de repli n'est pas une calibration : elle n'est pas mise en cache
+    if cache_path is not None and measured:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'chars': calibrated_chars, 'lut': [int(i) for i in lut]}, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"Impossible d'écrire le cache de palette: {e}")
+    
+    logger.info(f"Palette calibrée: {len(calibrated_chars)} niveaux")
+    return Palette(calibrated_chars, lut)
@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger.logger import logger
+from PIL import Image
+import numpy as np
+
+# Nombre de lignes copiées à la fois depuis PIL vers NumPy
+STRIP_ROWS = 256
+
+def _as_array(image):
+    """
+    Copie une image 'L' dans un tableau NumPy par bandes horizontales.
+    
+    np.asarray et tobytes() assemblent d'abord tous les octets dans un tampon
+    intermédiaire de la taille de l'image ; par bandes, le surcoût est
+    limité à STRIP_ROWS lignes.
+    """
+    array = np.empty((image.height, image.width), dtype=np.uint8)
+    for top in range(0, image.height, STRIP_ROWS):
+        bottom = min(top + STRIP_ROWS, image.height)
+        strip = image.crop((0, top, image.width, bottom)).tobytes()
+        array[top:bottom] = np.frombuffer(strip, dtype=np.uint8).reshape(bottom - top, image.width)
+    return array
+
+class GrayscalePyramid:
+    """
+    Pyramide multi-résolution (mipmap) d'une image en niveaux de gris.
+    
+    Chaque niveau est un tableau uint8 deux fois plus petit que le précédent,
+    de sorte qu'une largeur cible est toujours obtenue depuis un niveau au
+    plus deux fois plus grand qu'elle.
+    """
+    
+    # Largeur en dessous de laquelle on arrête de réduire
+    MIN_LEVEL_WIDTH = 16
+    
+    def __init__(self, image):
+        """
+        Construit la pyramide.
+        
+        Args:
+            image (PIL.Image): Image source (convertie en niveaux de gris)
+        """
+        level = image.convert('L')
+        self.size = level.size
+        self.levels = [_as_array(level)]
+        
+        # Réduction 2x2 par moyenne de boîte, effectuée en C par PIL
+        while level.width // 2 >= self.MIN_LEVEL_WIDTH and level.height >= 2:
+            level = level.reduce(2)
+            self.levels.append(_as_array(level))
+        
+        logger.debug(f"Pyramide construite: {len(self.levels)} niveaux, {self.nbytes / 1e6:.1f} Mo")
+    
+    @property
+    def nbytes(self):
+        """Mémoire occupée par tous les niveaux, en octets."""
+        return sum(level.nbytes for level in self.levels)
+    
+    def resize(self, size):
+        """
+        Produit l'image en niveaux de gris à la taille demandée depuis le
+        plus petit niveau au moins aussi grand.
+        
+        Args:
+            size (tuple): Taille cible (largeur, hauteur) en pixels
+        
+        Returns:
+            PIL.Image: Image redimensionnée en mode 'L'
+        """
+        width, height = size
+        source = self.levels[0]
+        for level in reversed(self.levels):
+            if level.shape[1] >= width and level.shape[0] >= height:
+                source = level
+                break
+        return Image.fromarray(source).resize(size)
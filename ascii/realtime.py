@@ -0,0 +1,377 @@
+"""Rendu ASCII en temps réel dans le terminal à partir d'une source d'images."""
+
+import sys
+import os
+import glob
+import time
+from abc import ABC, abstractmethod
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger.logger import logger
+from PIL import Image
+import numpy as np
+
+from generator import ASCIIGenerator
+from palettes import codes_to_lines
+from kernels import get_backend
+
+# Import conditionnel pour la capture webcam (V4L2 via OpenCV)
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# Séquences d'échappement du terminal
+CURSOR_HOME = "\033[H"
+CLEAR_SCREEN = "\033[2J"
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff')
+
+class FrameSource(ABC):
+    """Source d'images pour le rendu temps réel."""
+    
+    @abstractmethod
+    def read(self):
+        """
+        Lit l'image suivante.
+        
+        Returns:
+            PIL.Image: Image suivante, ou None quand la source est épuisée
+        """
+    
+    def skip(self):
+        """
+        Passe l'image suivante sans la décoder si la source le permet.
+        
+        Returns:
+            bool: False quand la source est épuisée
+        """
+        return self.read() is not None
+    
+    def close(self):
+        """Libère les ressources de la source."""
+        pass
+
+class V4L2FrameSource(FrameSource):
+    """Capture depuis un périphérique vidéo V4L2 (webcam)."""
+    
+    def __init__(self, device=0):
+        """
+        Ouvre le périphérique vidéo.
+        
+        Args:
+            device (int | str): Index ou chemin du périphérique (ex: '/dev/video0')
+        """
+        if not CV2_AVAILABLE:
+            raise RuntimeError("OpenCV non disponible - Installer avec 'pip install opencv-python'")
+        
+        self.capture = cv2.VideoCapture(device, cv2.CAP_V4L2)
+        if not self.capture.isOpened():
+            raise RuntimeError(f"Impossible d'ouvrir le périphérique vidéo {device}")
+        logger.info(f"Capture vidéo ouverte: {device}")
+    
+    def read(self):
+        ok, frame = self.capture.read()
+        if not ok:
+            return None
+        # Conversion directe en niveaux de gris : seule la luminance est utilisée
+        return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), mode='L')
+    
+    def skip(self):
+        # Capture sans décodage ni conversion
+        return self.capture.grab()
+    
+    def close(self):
+        self.capture.release()
+
+class DirectoryFrameSource(FrameSource):
+    """Lecture d'une séquence d'images depuis un dossier (ordre alphabétique)."""
+    
+    def __init__(self, directory, loop=False):
+        """
+        Liste les images du dossier.
+        
+        Args:
+            directory (str): Dossier contenant les images
+            loop (bool): Recommencer au début une fois la séquence terminée
+        """
+        self.paths = sorted(path for path in glob.glob(os.path.join(directory, '*'))
+                            if path.lower().endswith(IMAGE_EXTENSIONS))
+        if not self.paths:
+            raise RuntimeError(f"Aucune image trouvée dans {directory}")
+        self.loop = loop
+        self._index = 0
+        logger.info(f"Séquence de {len(self.paths)} images chargée depuis {directory}")
+    
+    def read(self):
+        if self._index >= len(self.paths):
+            if not self.loop:
+                return None
+            self._index = 0
+        
+        path = self.paths[self._index]
+        self._index += 1
+        with Image.open(path) as image:
+            return image.convert('L')
+    
+    def skip(self):
+        if self._index >= len(self.paths):
+            if not self.loop:
+                return False
+            self._index = 0
+        self._index += 1
+        return True
+
+class SyntheticFrameSource(FrameSource):
+    """Images générées (dégradé animé), utiles pour les tests et les mesures."""
+    
+    def __init__(self, width=640, height=480, frame_count=None):
+        """
+        Initialise le générateur d'images.
+        
+        Args:
+            width (int): Largeur des images en pixels
+            height (int): Hauteur des images en pixels
+            frame_count (int): Nombre d'images à produire (illimité si None)
+        """
+        self.frame_count = frame_count
+        self._index = 0
+        
+        # Grilles de coordonnées calculées une seule fois
+        self._x = np.linspace(0.0, 4 * np.pi, width, dtype=np.float32)[None, :]
+        self._y = np.linspace(0.0, 3 * np.pi, height, dtype=np.float32)[:, None]
+        self._frame = np.empty((height, width), dtype=np.float32)
+    
+    def read(self):
+        if self.frame_count is not None and self._index >= self.frame_count:
+            return None
+        
+        phase = self._index * 0.15
+        self._index += 1
+        np.add(self._x, phase, out=self._frame)
+        np.sin(self._frame, out=self._frame)
+        self._frame += np.cos(self._y - phase)
+        # Valeurs dans [-2, 2] ramenées à [0, 255]
+        return Image.fromarray(((self._frame + 2.0) * 63.75).astype(np.uint8), mode='L')
+    
+    def skip(self):
+        if self.frame_count is not None and self._index >= self.frame_count:
+            return False
+        self._index += 1
+        return True
+
+def open_frame_source(source=None):
+    """
+    Ouvre une source d'images à partir d'une description.
+    
+    Args:
+        source (str): 'synthetic', chemin d'un dossier, chemin d'un périphérique
+                      vidéo, ou None pour la webcam si présente (images synthétiques sinon)
+    
+    Returns:
+        FrameSource: Source ouverte
+    """
+    if source == 'synthetic':
+        return SyntheticFrameSource()
+    if source is not None and os.path.isdir(source):
+        return DirectoryFrameSource(source)
+    if source is not None:
+        return V4L2FrameSource(source)
+    
+    devices = sorted(glob.glob('/dev/video*'))
+    if devices and CV2_AVAILABLE:
+        return V4L2FrameSource(devices[0])
+    
+    logger.warning("Aucune webcam disponible - Utilisation d'images synthétiques")
+    return SyntheticFrameSource()
+
+class RealtimeRenderer:
+    """
+    Rendu ASCII en continu dans le terminal.
+    
+    Chaque image est réduite, convertie en luminance et quantifiée par le
+    backend de noyaux (Numba si installé, NumPy sinon). Seules les lignes modifiées depuis l'image précédente sont
+    réécrites. Si la conversion dépasse le budget par image, les images en
+    retard sont sautées puis la largeur est réduite.
+    """
+    
+    # Nombre d'images consécutives hors budget avant de réduire la largeur
+    OVER_BUDGET_FRAMES = 5
+    # Nombre d'images consécutives sous la moitié du budget avant de l'augmenter
+    UNDER_BUDGET_FRAMES = 30
+    # Pas de variation de la largeur (fraction de la largeur cible)
+    WIDTH_STEP = 0.1
+    
+    def __init__(self, source, width=100, ascii_chars='standard', fps=15, min_width=20,
+                 generator=None, output=None, backend=None):
+        """
+        Initialise le rendu temps réel.
+        
+        Args:
+            source (FrameSource): Source d'images
+            width (int): Largeur cible en caractères
+            ascii_chars (str): Palette à utiliser
+            fps (float): Images par seconde visées (fixe le budget par image)
+            min_width (int): Largeur minimale en cas de retard
+            generator (ASCIIGenerator): Générateur à utiliser (nouvelle instance si None)
+            output (file): Flux de sortie (sys.stdout par défaut)
+            backend (str): Backend de noyaux ('numpy', 'numba', ou None pour le choix automatique)
+        """
+        if ascii_chars in ASCIIGenerator.SUBCELL_MODES:
+            raise ValueError(f"Le mode '{ascii_chars}' n'est pas supporté en temps réel")
+        
+        self.source = source
+        self.target_width = width
+        self.width = width
+        self.min_width = min(min_width, width)
+        self.frame_budget = 1.0 / fps
+        self.generator = generator or ASCIIGenerator(ascii_chars)
+        self.palette = self.generator.get_palette(ascii_chars)
+        self.output = output or sys.stdout
+        
+        # Compilation éventuelle des noyaux avant la première image
+        self.kernels = get_backend(backend)
+        self.kernels.warm_up()
+        
+        # Tampons de points de code préalloués (image courante et précédente)
+        self._codes = None
+        self._previous = None
+        self._force_redraw = True
+        
+        self._over_budget = 0
+        self._under_budget = 0
+        self.stats = {'rendered': 0, 'skipped': 0, 'width_changes': 0, 'total_latency': 0.0}
+    
+    def _allocate(self, shape):
+        """(Ré)alloue les tampons si la taille de la sortie change."""
+        if self._codes is None or self._codes.shape != shape:
+            self._codes = np.empty(shape, dtype=np.uint32)
+            self._previous = np.empty(shape, dtype=np.uint32)
+            self._force_redraw = True
+    
+    def render_frame(self, frame):
+        """
+        Convertit une image et redessine les lignes modifiées.
+        
+        Args:
+            frame (PIL.Image): Image source
+        
+        Returns:
+            int: Nombre de lignes réécrites
+        """
+        if frame.mode not in ('L', 'RGB'):
+            frame = frame.convert('L')
+        pixels = np.asarray(frame, dtype=np.uint8)
+        width, height = self.generator._output_size(frame.size, self.width)
+        
+        # Moyenne par cellule, luminance et quantification écrites directement
+        # dans le tampon préalloué (en une seule passe avec le backend Numba)
+        self._allocate((height, width))
+        self.kernels.render(pixels, height, width, self.palette.codes, out=self._codes)
+        
+        if self._force_redraw:
+            changed = np.arange(self._codes.shape[0])
+            buffer = [CLEAR_SCREEN]
+        else:
+            changed = np.flatnonzero((self._codes != self._previous).any(axis=1))
+            buffer = []
+        
+        if len(changed):
+            for row, line in zip(changed, codes_to_lines(self._codes[changed])):
+                buffer.append(f"\033[{row + 1};1H{line}")
+            buffer.append(CURSOR_HOME)
+            self.output.write(''.join(buffer))
+            self.output.flush()
+        
+        # Échange des tampons plutôt que copie
+        self._codes, self._previous = self._previous, self._codes
+        self._force_redraw = False
+        return len(changed)
+    
+    def _adapt(self, elapsed):
+        """
+        Ajuste le rendu après une image.
+        
+        Args:
+            elapsed (float): Durée de conversion de l'image en secondes
+        
+        Returns:
+            int: Nombre d'images à sauter pour rattraper le retard
+        """
+        step = max(1, int(self.target_width * self.WIDTH_STEP))
+        
+        if elapsed > self.frame_budget:
+            self._over_budget += 1
+            self._under_budget = 0
+            if self._over_budget >= self.OVER_BUDGET_FRAMES and self.width > self.min_width:
+                self.width = max(self.min_width, self.width - step)
+                self._over_budget = 0
+                self.stats['width_changes'] += 1
+            return int(elapsed / self.frame_budget)
+        
+        self._over_budget = 0
+        if elapsed < self.frame_budget / 2 and self.width < self.target_width:
+            self._under_budget += 1
+            if self._under_budget >= self.UNDER_BUDGET_FRAMES:
+                self.width = min(self.target_width, self.width + step)
+                self._under_budget = 0
+                self.stats['width_changes'] += 1
+        else:
+            self._under_budget = 0
+        return 0
+    
+    def run(self, max_frames=None):
+        """
+        Boucle de rendu jusqu'à épuisement de la source, max_frames ou Ctrl+C.
+        
+        Args:
+            max_frames (int): Nombre maximal d'images affichées (illimité si None)
+        
+        Returns:
+            dict: Statistiques (images rendues, sautées, changements de largeur, latence moyenne)
+        """
+        self.output.write(HIDE_CURSOR)
+        # Aucun message sur stdout pendant le dessin : il s'intercalerait dans l'image
+        with logger.redirect(sys.stderr):
+            try:
+                while max_frames is None or self.stats['rendered'] < max_frames:
+                    frame = self.source.read()
+                    if frame is None:
+                        break
+                    
+                    start = time.perf_counter()
+                    self.render_frame(frame)
+                    elapsed = time.perf_counter() - start
+                    self.stats['rendered'] += 1
+                    self.stats['total_latency'] += elapsed
+                    
+                    # Sauter les images en retard, sans les décoder
+                    for _ in range(self._adapt(elapsed)):
+                        if not self.source.skip():
+                            break
+                        self.stats['skipped'] += 1
+                    
+                    # Respecter la cadence pour les sources plus rapides que l'affichage
+                    remaining = self.frame_budget - (time.perf_counter() - start)
+                    if remaining > 0:
+                        time.sleep(remaining)
+            except KeyboardInterrupt:
+                logger.info("Rendu temps réel interrompu")
+            finally:
+                self.output.write(SHOW_CURSOR + "\n")
+                self.output.flush()
+                self.source.close()
+        
+        rendered = self.stats['rendered']
+        self.stats['average_latency'] = self.stats['total_latency'] / rendered if rendered else 0.0
+        logger.info(f"Rendu terminé: {rendered} images, {self.stats['skipped']} sautées, "
+                    f"latence moyenne {self.stats['average_latency'] * 1000:.1f} ms")
+        return self.stats
+
+if __name__ == "__main__":
+    source_arg = sys.argv[1] if len(sys.argv) > 1 else None
+    width_arg = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    RealtimeRenderer(open_frame_source(source_arg), width=width_arg).run()
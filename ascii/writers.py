@@ -0,0 +1,176 @@
+import sys
+import os
+import io
+import gzip
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger.logger import logger
+import numpy as np
+
+# Import conditionnel pour la compression zstd
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Taille des écritures vers la destination (1 Mo)
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+NEWLINE = ord('\n')
+
+class AsciiWriter:
+    """
+    Écriture en flux de l'art ASCII vers un fichier, un flux ou un tampon mémoire.
+    
+    Les lignes sont écrites par blocs directement depuis le tableau NumPy des
+    points de code, sans chaîne Python intermédiaire par ligne. Les lignes
+    sont séparées par '\\n', sans saut de ligne final (comme generate_ascii).
+    """
+    
+    def __init__(self, stream, close_stream=True, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        Initialise l'écrivain.
+        
+        Args:
+            stream (file): Flux binaire (ou texte) de destination
+            close_stream (bool): Fermer le flux avec l'écrivain
+            buffer_size (int): Taille des écritures regroupées en octets
+        """
+        self.stream = stream
+        self.close_stream = close_stream
+        self.buffer_size = buffer_size
+        self.bytes_written = 0
+        self.rows_written = 0
+        
+        self._text_stream = isinstance(stream, io.TextIOBase)
+        self._pending = []
+        self._pending_size = 0
+        # Tampon de lignes réutilisé d'un bloc à l'autre
+        self._row_buffer = None
+    
+    def _write_bytes(self, data):
+        """
+        Regroupe les données jusqu'à buffer_size avant de les envoyer au flux.
+        
+        Args:
+            data (bytes | memoryview): Données à écrire (une vue n'est pas conservée)
+        """
+        self.bytes_written += len(data)
+        if not self._pending and len(data) >= self.buffer_size:
+            # Gros bloc : écrit directement, sans copie
+            self._send(data)
+            return
+        self._pending.append(bytes(data))
+        self._pending_size += len(data)
+        if self._pending_size >= self.buffer_size:
+            self.flush()
+    
+    def _send(self, data):
+        """Envoie des données au flux (décodées si le flux est en mode texte)."""
+        if self._text_stream:
+            self.stream.write(bytes(data).decode('utf-8'))
+        else:
+            self.stream.write(data)
+    
+    def flush(self):
+        """Envoie les données en attente vers le flux."""
+        if not self._pending:
+            return
+        self._send(self._pending[0] if len(self._pending) == 1 else b''.join(self._pending))
+        self._pending = []
+        self._pending_size = 0
+    
+    def write_codes(self, codes):
+        """
+        Écrit un bloc de lignes à partir d'un tableau de points de code.
+        
+        Args:
+            codes (numpy.ndarray): Tableau 2D de points de code (une ligne par rangée)
+        """
+        height, width = codes.shape
+        if height == 0:
+            return
+        
+        # Colonne 0 réservée au séparateur de lignes
+        if codes.max(initial=0) < 128:
+            # Palette ASCII : un octet par caractère, écrit directement depuis le tableau
+            if self._row_buffer is None or self._row_buffer.shape != (height, width + 1):
+                self._row_buffer = np.empty((height, width + 1), dtype=np.uint8)
+            buffer = self._row_buffer
+            buffer[:, 0] = NEWLINE
+            buffer[:, 1:] = codes
+            data = memoryview(buffer).cast('B')
+        else:
+            # Caractères Unicode : encodage UTF-8 du bloc entier en une fois
+            buffer = np.empty((height, width + 1), dtype=np.uint32)
+            buffer[:, 0] = NEWLINE
+            buffer[:, 1:] = codes
+            data = buffer.tobytes().decode('utf-32-le').encode('utf-8')
+        
+        if self.rows_written == 0:
+            data = data[1:]
+        self.rows_written += height
+        self._write_bytes(data)
+    
+    def write_text(self, text):
+        """
+        Écrit un texte déjà assemblé.
+        
+        Args:
+            text (str): Texte à écrire
+        """
+        self._write_bytes(text.encode('utf-8'))
+    
+    def close(self):
+        """Vide les données en attente et ferme le flux si nécessaire."""
+        self.flush()
+        if self.close_stream:
+            self.stream.close()
+        elif hasattr(self.stream, 'flush'):
+            self.stream.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def open_writer(destination, compression=None, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Ouvre un écrivain vers une destination.
+    
+    Args:
+        destination (str | file): Chemin de fichier, '-' pour la sortie standard,
+                                  ou flux déjà ouvert (ex: io.BytesIO)
+        compression (str): 'gzip', 'zstd' ou None (déduit de l'extension .gz / .zst)
+        buffer_size (int): Taille des écritures regroupées en octets
+    
+    Returns:
+        AsciiWriter: Écrivain ouvert
+    """
+    if destination == '-':
+        return AsciiWriter(sys.stdout.buffer, close_stream=False, buffer_size=buffer_size)
+    if not isinstance(destination, (str, os.PathLike)):
+        return AsciiWriter(destination, close_stream=False, buffer_size=buffer_size)
+    
+    path = os.fspath(destination)
+    if compression is None:
+        if path.endswith('.gz'):
+            compression = 'gzip'
+        elif path.endswith('.zst'):
+            compression = 'zstd'
+    
+    if compression == 'gzip':
+        stream = gzip.open(path, 'wb', compresslevel=6)
+    elif compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard non disponible - Installer avec 'pip install zstandard'")
+        stream = zstandard.ZstdCompressor().stream_writer(open(path, 'wb'), closefd=True)
+    elif compression is None:
+        stream = open(path, 'wb', buffering=buffer_size)
+    else:
+        raise ValueError(f"Compression inconnue: {compression}")
+    
+    logger.debug(f"Écriture vers {path} (compression: {compression or 'aucune'})")
+    return AsciiWriter(stream, buffer_size=buffer_size)
@@ -1,4 +1,5 @@
 import sys
+from contextlib import contextmanager
 from datetime import datetime
 
 class Logger:
@@ -10,11 +11,25 @@ class Logger:
         "RESET": "\033[0m"
     }
 
+    # Flux imposé à tous les niveaux (None : stdout, stderr pour les erreurs)
+    stream = None
+
     def _log(self, level, message):
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         color = self.COLORS.get(level, self.COLORS["RESET"])
         reset = self.COLORS["RESET"]
-        print(f"{color}[{now}] -- {level} -- {message}{reset}", file=sys.stderr if level == "ERROR" else sys.stdout)
+        stream = self.stream or (sys.stderr if level == "ERROR" else sys.stdout)
+        print(f"{color}[{now}] -- {level} -- {message}{reset}", file=stream)
+
+    @contextmanager
+    def redirect(self, stream):
+        """Envoie tous les messages vers stream le temps du bloc (ex: quand stdout porte des données)."""
+        previous = self.stream
+        self.stream = stream
+        try:
+            yield
+        finally:
+            self.stream = previous
 
     def info(self, message):
         self._log("INFO", message)
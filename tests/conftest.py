@@ -0,0 +1,24 @@
+import sys
+import os
+
+# Les modules du projet s'importent entre eux depuis le dossier ascii/ (ex: from generator import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ascii'))
+
+import numpy as np
+import pytest
+from PIL import Image
+
+@pytest.fixture
+def image_paths(tmp_path):
+    """Quelques images de tailles, modes et formats différents."""
+    rng = np.random.default_rng(0)
+    paths = []
+    for i, (size, mode, ext) in enumerate([((320, 240), 'RGB', 'png'), ((123, 457), 'RGB', 'jpg'),
+                                           ((640, 96), 'L', 'png'), ((200, 200), 'RGBA', 'png')]):
+        bands = len(mode)
+        pixels = rng.integers(0, 256, (size[1], size[0], bands), dtype=np.uint8)
+        image = Image.fromarray(pixels[..., 0] if bands == 1 else pixels, mode=mode)
+        path = str(tmp_path / f"image_{i}.{ext}")
+        image.save(path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,189 @@
+import os
+import shutil
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import batch
+from batch import BatchBackgroundRemover, DeduplicatingBatchProcessor, hamming_distance, output_names, popcount64
+from generator import ASCIIGenerator
+
+def test_output_names_keep_relative_paths(tmp_path):
+    paths = [str(tmp_path / 'dir1' / 'a.png'), str(tmp_path / 'dir2' / 'a.png'),
+             str(tmp_path / 'dir2' / 'b.png'), str(tmp_path / 'dir2' / 'b.jpg')]
+    names = output_names(paths)
+    assert names[paths[0]] == os.path.join('dir1', 'a.txt')
+    assert names[paths[1]] == os.path.join('dir2', 'a.txt')
+    assert names[paths[2]] == os.path.join('dir2', 'b.png.txt')
+    assert names[paths[3]] == os.path.join('dir2', 'b.jpg.txt')
+    assert len(set(names.values())) == len(paths)
+
+def test_same_basename_in_different_folders_not_overwritten(image_paths, tmp_path):
+    paths = []
+    for folder, source in (('dir1', image_paths[0]), ('dir2', image_paths[2])):
+        os.makedirs(tmp_path / folder)
+        paths.append(str(tmp_path / folder / 'a.png'))
+        shutil.copy(source, paths[-1])
+    
+    output_dir = tmp_path / 'out'
+    results = DeduplicatingBatchProcessor().process(paths, width=30, output_dir=str(output_dir))
+    for path, folder in zip(paths, ('dir1', 'dir2')):
+        assert (output_dir / folder / 'a.txt').read_text(encoding='utf-8') == results[path]
+    assert results[paths[0]] != results[paths[1]]
+
+def test_duplicates_reuse_results(image_paths, tmp_path):
+    copy = str(tmp_path / 'copy.png')
+    shutil.copy(image_paths[0], copy)
+    resized = str(tmp_path / 'resized.png')
+    with Image.open(image_paths[0]) as image:
+        image.resize((image.width // 2, image.height // 2)).save(resized)
+    
+    processor = DeduplicatingBatchProcessor(near_threshold=6)
+    paths = image_paths + [copy, resized, str(tmp_path / 'missing.png')]
+    results = processor.process(paths, width=40)
+    
+    generator = ASCIIGenerator()
+    for path in image_paths:
+        assert results[path] == generator.generate_ascii(path, width=40)
+    assert results[copy] == results[image_paths[0]]
+    assert results[resized] == results[image_paths[0]]
+    assert results[paths[-1]] is None
+    assert processor.stats['exact_hits'] == 1
+    assert processor.stats['near_hits'] == 1
+    assert processor.stats['ascii_reused'] == 2
+
+@pytest.mark.parametrize('ascii_chars', ['detailed', 'blocks', 'braille'])
+def test_batch_matches_generate_ascii(image_paths, ascii_chars):
+    results = DeduplicatingBatchProcessor().process(image_paths, width=33, ascii_chars=ascii_chars)
+    generator = ASCIIGenerator()
+    for path in image_paths:
+        assert results[path] == generator.generate_ascii(path, width=33, ascii_chars=ascii_chars)
+
+def test_popcount_fallback_matches(monkeypatch):
+    values = np.random.default_rng(1).integers(0, 2**64, 500, dtype=np.uint64)
+    expected = [bin(int(value)).count('1') for value in values]
+    assert popcount64(values).tolist() == expected
+    monkeypatch.delattr(np, 'bitwise_count', raising=False)
+    assert popcount64(values).tolist() == expected
+
+def test_near_duplicate_lookup_matches_pairwise_scan():
+    rng = np.random.default_rng(2)
+    hashes = [int(value) for value in rng.integers(0, 2**64, 300, dtype=np.uint64)]
+    # Quasi-doublons : quelques bits inversés
+    hashes += [value ^ (1 << int(bit)) ^ (1 << 63) for value, bit in zip(hashes[:100], rng.integers(0, 63, 100))]
+    processor = DeduplicatingBatchProcessor(near_threshold=4)
+    
+    references = []
+    for i, perceptual_hash in enumerate(hashes):
+        expected = next((exact for reference_hash, exact in references
+                         if hamming_distance(perceptual_hash, reference_hash) <= 4), None)
+        canonical, match = processor._find_canonical(f"file{i}", perceptual_hash)
+        if expected is None:
+            assert (canonical, match) == (f"file{i}", None)
+            references.append((perceptual_hash, canonical))
+        else:
+            assert (canonical, match) == (expected, 'near')
+    assert processor._references == [exact for _, exact in references]
+
+def test_references_converted_in_bounded_chunks(image_paths, monkeypatch):
+    processor = DeduplicatingBatchProcessor()
+    processor.DEFAULT_CHUNK_SIZE = 3
+    chunk_sizes = []
+    convert_chunk = processor._convert_chunk
+    
+    def spy(references, params):
+        chunk_sizes.append(len(references))
+        convert_chunk(references, params)
+    
+    monkeypatch.setattr(processor, '_convert_chunk', spy)
+    results = processor.process(image_paths, width=20)
+    assert chunk_sizes == [3, 1]
+    assert all(results.values())
+
+def test_no_bg_cache_is_bounded():
+    processor = DeduplicatingBatchProcessor(no_bg_cache_size=2)
+    for key in 'abc':
+        processor._cache_no_bg(key, Image.new('RGB', (4, 4)))
+    assert list(processor._no_bg_cache) == ['b', 'c']
+    
+    disabled = DeduplicatingBatchProcessor(no_bg_cache_size=0)
+    disabled._cache_no_bg('a', Image.new('RGB', (4, 4)))
+    assert not disabled._no_bg_cache
+
+class StubInnerSession:
+    """Session ONNX factice : premier plan là où le canal rouge normalisé est positif."""
+    
+    def __init__(self, shape):
+        self.shape = shape
+        self.batches = []
+    
+    def get_inputs(self):
+        return [SimpleNamespace(name='input', shape=self.shape)]
+    
+    def run(self, outputs, feed):
+        inputs = feed['input']
+        self.batches.append(inputs.shape)
+        return [(inputs[:, :1] > 0).astype(np.float32)]
+
+@pytest.fixture
+def stub_rembg(monkeypatch):
+    """Remplace rembg par des sessions factices dont la forme d'entrée est réglable."""
+    stub = SimpleNamespace(shape=[None, 3, 320, 320], sessions=[])
+    
+    def new_session(model_name, **kwargs):
+        stub.sessions.append(SimpleNamespace(inner_session=StubInnerSession(list(stub.shape))))
+        return stub.sessions[-1]
+    
+    monkeypatch.setattr(batch, 'REMBG_AVAILABLE', True)
+    monkeypatch.setattr(batch, 'new_session', new_session, raising=False)
+    return stub
+
+def _half_white(size):
+    """Image dont la moitié gauche est blanche (premier plan) et la droite noire."""
+    image = Image.new('RGB', size, (0, 0, 0))
+    image.paste((255, 255, 255), (0, 0, size[0] // 2, size[1]))
+    return image
+
+@pytest.mark.parametrize("model_shape", [(None, 3, 320, 320), (None, 3, 240, 320), (None, 3, 320, 200)])
+@pytest.mark.parametrize("size", [(400, 100), (90, 360), (250, 250)])
+def test_masks_cropped_to_image_after_letterbox(stub_rembg, model_shape, size):
+    stub_rembg.shape = list(model_shape)
+    remover = BatchBackgroundRemover(batch_size=4)
+    
+    result = np.asarray(remover.remove_backgrounds([_half_white(size)])[0].convert('L'))
+    assert result.shape == (size[1], size[0])
+    assert remover.input_size == (model_shape[3], model_shape[2])
+    # Le masque recouvre exactement la moitié gauche (loin de la frontière)
+    margin = max(4, size[0] // 10)
+    assert (result[:, :size[0] // 2 - margin] > 200).all()
+    assert (result[:, size[0] // 2 + margin:] == 0).all()
+
+def test_images_sent_in_batches(stub_rembg):
+    remover = BatchBackgroundRemover(batch_size=2)
+    images = [_half_white((64 + i, 48)) for i in range(5)]
+    results = remover.remove_backgrounds(images)
+    
+    assert [shape[0] for shape in stub_rembg.sessions[0].inner_session.batches] == [2, 2, 1]
+    assert [result.size for result in results] == [image.size for image in images]
+
+def test_batch_size_capped_by_model(stub_rembg):
+    stub_rembg.shape = [1, 3, 320, 320]
+    remover = BatchBackgroundRemover(batch_size=4)
+    remover.remove_backgrounds([_half_white((80, 60)) for _ in range(3)])
+    
+    assert remover.batch_size == 1
+    assert [shape[0] for shape in stub_rembg.sessions[0].inner_session.batches] == [1, 1, 1]
+
+def test_unsupported_model_rejected():
+    with pytest.raises(ValueError):
+        BatchBackgroundRemover('birefnet-general')
+
+def test_isnet_normalisation_matches_rembg():
+    # Sessions DIS de rembg : moyenne ImageNet, écart-type 1, entrée 1024
+    remover = BatchBackgroundRemover('isnet-general-use')
+    canvas, box = remover._letterbox(Image.new('RGB', (100, 50), (255, 255, 255)))
+    x, y, width, height = box
+    assert canvas.shape == (3, 1024, 1024)
+    assert np.allclose(canvas[:, y + 1, x + 1], [1 - 0.485, 1 - 0.456, 1 - 0.406])
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+import kernels
+from kernels import available_backends, get_backend
+
+# Formes impaires, plus petites que la sortie (suréchantillonnage) et dégénérées
+SHAPES = [(1, 1), (3, 5), (7, 13), (64, 48), (101, 257)]
+OUTPUTS = [(1, 1), (2, 3), (5, 7), (40, 30), (150, 300)]
+
+@pytest.fixture(params=available_backends())
+def backend(request):
+    kernels_ = get_backend(request.param)
+    kernels_.warm_up()
+    return kernels_
+
+def _pixels(shape, channels=None, readonly=False):
+    size = shape if channels is None else shape + (channels,)
+    pixels = np.random.default_rng(sum(size)).integers(0, 256, size, dtype=np.uint8)
+    pixels.setflags(write=not readonly)
+    return pixels
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_luma_matches_pil(backend, shape):
+    rgb = _pixels(shape, 3, readonly=True)
+    expected = np.asarray(Image.fromarray(rgb).convert('L'))
+    assert np.array_equal(backend.luma(rgb), expected)
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("output", OUTPUTS)
+@pytest.mark.parametrize("channels", [None, 3])
+def test_cell_average_and_render_match_reference(backend, shape, output, channels):
+    reference = get_backend('numpy')
+    pixels = _pixels(shape, channels, readonly=True)
+    codes = ((np.arange(256, dtype=np.uint32) * 7) % 95) + 32
+    
+    expected = reference.cell_average(pixels, *output)
+    assert np.array_equal(backend.cell_average(pixels, *output), expected)
+    assert np.array_equal(backend.render(pixels, *output, codes), codes[expected])
+    
+    out = np.empty(output, dtype=np.uint32)
+    assert backend.render(pixels, *output, codes, out=out) is out
+    assert np.array_equal(out, codes[expected])
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_quantize_and_dither_match_reference(backend, shape):
+    reference = get_backend('numpy')
+    gray = _pixels(shape, readonly=True)
+    codes = np.arange(0x2800, 0x2900, dtype=np.uint32)
+    
+    assert np.array_equal(backend.quantize(gray, codes), reference.quantize(gray, codes))
+    assert np.array_equal(backend.ordered_dither(gray), reference.ordered_dither(gray))
+    # Entrée non contiguë (vue d'une image plus grande)
+    view = _pixels((shape[0] * 2, shape[1] * 2))[::2, ::2]
+    assert np.array_equal(backend.quantize(view, codes), reference.quantize(view, codes))
+
+@pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="Numba non installé")
+def test_warm_up_compiles_read_only_signatures():
+    backend = get_backend('numba')
+    backend.warm_up()
+    compiled = [kernels._render_gray, kernels._render_rgb, kernels._quantize_numba,
+                kernels._ordered_dither_numba, kernels._cell_average_gray, kernels._luma_numba]
+    counts = [len(kernel.signatures) for kernel in compiled]
+    
+    gray = np.asarray(Image.new('L', (40, 30)))
+    rgb = np.asarray(Image.new('RGB', (40, 30)))
+    codes = np.arange(256, dtype=np.uint32)
+    backend.render(gray, 3, 4, codes)
+    backend.render(rgb, 3, 4, codes)
+    backend.quantize(gray, codes)
+    backend.ordered_dither(gray)
+    backend.cell_average(gray, 3, 4)
+    backend.luma(rgb)
+    assert [len(kernel.signatures) for kernel in compiled] == counts
@@ -0,0 +1,39 @@
+import pytest
+
+from generator import ASCIIGenerator
+from memory_profile import (make_reference_image, measure_peak_rss, profile_generate_ascii,
+                            PEAK_RSS_BUDGET, PEAK_BUDGET, REFERENCE_WIDTH)
+
+@pytest.fixture(scope='module')
+def reference_image(tmp_path_factory):
+    return make_reference_image(str(tmp_path_factory.mktemp('memory') / 'reference.png'))
+
+def test_peak_rss_within_budget(reference_image):
+    # Toutes les allocations, tampons PIL compris : une copie de plus de
+    # l'image 4000x3000 (36 Mo) suffit à dépasser le budget
+    peak = measure_peak_rss(reference_image, width=REFERENCE_WIDTH)
+    if peak is None:
+        pytest.skip("Mesure du pic RSS indisponible sur cette plateforme")
+    assert peak <= PEAK_RSS_BUDGET, f"pic RSS {peak / 1e6:.1f} Mo"
+
+@pytest.mark.parametrize("ascii_chars", [None, 'braille'])
+def test_traced_peak_within_budget(reference_image, ascii_chars):
+    generator = ASCIIGenerator()
+    cold = profile_generate_ascii(reference_image, ascii_chars=ascii_chars, generator=generator)
+    warm = profile_generate_ascii(reference_image, ascii_chars=ascii_chars, generator=generator)
+    assert cold['peak'] <= PEAK_BUDGET
+    # Avec le cache, seule la petite image redimensionnée est allouée
+    assert warm['peak'] <= PEAK_BUDGET // 16
+
+def test_load_image_returns_a_copy(image_paths):
+    generator = ASCIIGenerator()
+    expected = generator.generate_ascii(image_paths[0], width=30)
+    
+    image = generator.load_image(image_paths[0])
+    assert image is not generator._snapshot.original_image
+    assert image is not generator.load_image(image_paths[0])
+    
+    # Modifier la copie ne touche ni le cache ni la conversion
+    image.paste(255, (0, 0) + image.size)
+    assert generator._snapshot.original_image.getextrema() != image.getextrema()
+    assert generator.generate_ascii(image_paths[0], width=30) == expected
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+import palettes
+from palettes import calibrate_palette, find_missing_glyphs, BLOCK_CHARS, BRAILLE_CHARS
+
+def test_missing_glyphs_detected_with_default_font():
+    # La police par défaut de PIL ne couvre ni les blocs ni le Braille
+    assert set(find_missing_glyphs(BLOCK_CHARS)) == set(BLOCK_CHARS) - {' '}
+    assert find_missing_glyphs(BRAILLE_CHARS) == BRAILLE_CHARS
+    assert find_missing_glyphs(" .:-=+*#%@") == ''
+
+def test_calibration_rejects_uncovered_glyphs(tmp_path):
+    with pytest.raises(ValueError):
+        calibrate_palette(BLOCK_CHARS, cache_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+def test_calibration_orders_by_ink_and_caches(tmp_path):
+    palette = calibrate_palette("@ .#", cache_dir=str(tmp_path))
+    assert palette.chars[0] == ' ' and palette.chars[-1] in '#@'
+    assert len(os.listdir(tmp_path)) == 1
+    assert calibrate_palette("@ .#", cache_dir=str(tmp_path)).chars == palette.chars
+
+@pytest.mark.parametrize("levels", [0, -3])
+def test_calibration_rejects_invalid_levels(levels, tmp_path):
+    with pytest.raises(ValueError):
+        calibrate_palette(" .:-=+*#%@", levels=levels, cache_dir=str(tmp_path))
+
+def test_levels_applied_when_densities_are_identical(monkeypatch, tmp_path):
+    # Densités toutes égales : repli sur une répartition linéaire
+    monkeypatch.setattr(palettes, 'measure_ink', lambda chars, *args: np.zeros(len(chars)))
+    palette = calibrate_palette(" .:-=+*#%@", levels=4, cache_dir=str(tmp_path))
+    assert palette.chars == " -*@"
+    # Le repli n'est pas une calibration et n'est pas mis en cache
+    assert os.listdir(tmp_path) == []
+
+def test_levels_resample_measured_palette(tmp_path):
+    palette = calibrate_palette(" .:-=+*#%@", levels=3, cache_dir=str(tmp_path))
+    assert len(palette.chars) == 3
+    assert calibrate_palette(" .:-=+*#%@", levels=1, cache_dir=str(tmp_path)).chars == ' '
+
+def test_register_palette_rejects_subcell_mode_names():
+    from generator import ASCIIGenerator
+    with pytest.raises(ValueError):
+        ASCIIGenerator.register_palette('braille', " .:#", calibrate=False)
+    assert 'braille' not in ASCIIGenerator.ASCII_CHARS
+
+def test_palette_tables_only_written_under_lock(monkeypatch):
+    from generator import ASCIIGenerator
+    
+    # Toute écriture dans l'une des deux tables doit se faire verrou pris :
+    # sinon un lecteur peut voir une palette dont les caractères diffèrent
+    # de ASCII_CHARS et la remplacer définitivement par une table linéaire
+    unlocked_writes = []
+    
+    class CheckedDict(dict):
+        def __setitem__(self, key, value):
+            if not ASCIIGenerator._PALETTES_LOCK.locked():
+                unlocked_writes.append(key)
+            super().__setitem__(key, value)
+    
+    monkeypatch.setattr(ASCIIGenerator, 'ASCII_CHARS', CheckedDict(ASCIIGenerator.ASCII_CHARS))
+    monkeypatch.setattr(ASCIIGenerator, '_PALETTES', CheckedDict())
+    
+    ASCIIGenerator.register_palette('locked', " .:#", calibrate=False)
+    ASCIIGenerator.register_palette('locked', " -=@", calibrate=False)
+    ASCIIGenerator.ASCII_CHARS.update(edited=" +*")
+    assert ASCIIGenerator.get_palette('edited').chars == " +*"
+    assert ASCIIGenerator.get_palette('locked').chars == " -=@"
+    assert unlocked_writes == []
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+import pyramid as pyramid_module
+from pyramid import GrayscalePyramid
+from generator import ASCIIGenerator
+
+@pytest.fixture
+def resized_sources(monkeypatch):
+    """Formes des niveaux passés à PIL par GrayscalePyramid.resize."""
+    shapes = []
+    fromarray = Image.fromarray
+    
+    def spy(array, *args, **kwargs):
+        shapes.append(array.shape)
+        return fromarray(array, *args, **kwargs)
+    
+    monkeypatch.setattr(pyramid_module.Image, 'fromarray', spy)
+    return shapes
+
+def _image(width, height, mode='RGB'):
+    rng = np.random.default_rng(width * height)
+    shape = (height, width, 3) if mode == 'RGB' else (height, width)
+    return Image.fromarray(rng.integers(0, 256, shape, dtype=np.uint8), mode=mode)
+
+def test_level_sizes_and_nbytes():
+    image = _image(1001, 333)
+    pyramid = GrayscalePyramid(image)
+    
+    shapes = [level.shape for level in pyramid.levels]
+    # Réduction de PIL : dimensions impaires arrondies au supérieur
+    assert shapes == [(333, 1001), (167, 501), (84, 251), (42, 126), (21, 63), (11, 32), (6, 16)]
+    assert shapes[-1][1] // 2 < GrayscalePyramid.MIN_LEVEL_WIDTH
+    assert all(level.dtype == np.uint8 for level in pyramid.levels)
+    assert pyramid.nbytes == sum(height * width for height, width in shapes)
+    assert pyramid.size == (1001, 333)
+    # Niveau 0 : la conversion en niveaux de gris de PIL
+    assert np.array_equal(pyramid.levels[0], np.asarray(image.convert('L')))
+
+@pytest.mark.parametrize("size, expected_level", [((1001, 333), 0), ((502, 100), 0), ((501, 167), 1),
+                                                  ((200, 168), 0), ((126, 42), 3), ((127, 20), 2),
+                                                  ((40, 12), 4), ((3, 2), 6)])
+def test_resize_uses_smallest_covering_level(resized_sources, size, expected_level):
+    pyramid = GrayscalePyramid(_image(1001, 333))
+    resized_sources.clear()
+    result = pyramid.resize(size)
+    
+    assert result.size == size and result.mode == 'L'
+    assert resized_sources == [pyramid.levels[expected_level].shape]
+
+def test_cache_info_tracks_pyramid_lifetime(image_paths):
+    generator = ASCIIGenerator()
+    assert generator.get_cache_info()['pyramid_bytes'] == 0
+    
+    generator.generate_ascii(image_paths[0], width=40)
+    info = generator.get_cache_info()
+    assert info['image_path'] == image_paths[0]
+    assert info['pyramid_bytes'] == generator._snapshot.pyramid.nbytes > 0
+    
+    # Une autre image évince la pyramide précédente avec l'entrée du cache
+    generator.generate_ascii(image_paths[2], width=40)
+    assert generator.get_cache_info()['pyramid_bytes'] == generator._snapshot.pyramid.nbytes
+    assert generator._snapshot.pyramid.size == Image.open(image_paths[2]).size
+    
+    generator.clear_cache()
+    assert generator.get_cache_info() == {'image_path': None, 'no_bg_cached': False, 'pyramid_bytes': 0}
+
+def test_warm_width_change_skips_full_resolution(tmp_path, resized_sources):
+    path = str(tmp_path / 'large.png')
+    _image(2400, 1800).save(path)
+    generator = ASCIIGenerator()
+    generator.generate_ascii(path, width=300)
+    full_resolution = generator._snapshot.pyramid.levels[0].shape
+    
+    resized_sources.clear()
+    for width in (50, 100, 200):
+        generator.generate_ascii(path, width=width)
+    assert len(resized_sources) == 3
+    assert full_resolution not in resized_sources
+    # Le niveau utilisé est au plus deux fois plus large que nécessaire
+    assert all(shape[1] < 2 * width for shape, width in zip(resized_sources, (50, 100, 200)))
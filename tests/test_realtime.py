@@ -0,0 +1,156 @@
+import io
+import re
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import realtime
+from realtime import FrameSource, DirectoryFrameSource, SyntheticFrameSource, RealtimeRenderer, CLEAR_SCREEN
+
+def _redrawn_rows(output):
+    """Lignes (numérotées à partir de 0) réécrites dans une sortie de rendu."""
+    return [int(row) - 1 for row in re.findall(r"\033\[(\d+);1H", output)]
+
+def _renderer(width=20, **kwargs):
+    output = io.StringIO()
+    renderer = RealtimeRenderer(SyntheticFrameSource(64, 48, frame_count=0), width=width,
+                                output=output, backend='numpy', **kwargs)
+    return renderer, output
+
+def test_frame_source_is_abstract():
+    with pytest.raises(TypeError):
+        FrameSource()
+
+def test_only_changed_rows_redrawn():
+    renderer, output = _renderer()
+    pixels = np.full((48, 64), 40, dtype=np.uint8)
+    rows = renderer.render_frame(Image.fromarray(pixels))
+    assert output.getvalue().startswith(CLEAR_SCREEN)
+    assert _redrawn_rows(output.getvalue()) == list(range(rows))
+    
+    # Même image : rien à redessiner
+    output.seek(0)
+    output.truncate()
+    assert renderer.render_frame(Image.fromarray(pixels)) == 0
+    assert output.getvalue() == ''
+    
+    # Bande modifiée en haut de l'image : seules ses lignes sont réécrites
+    pixels[:8] = 250
+    changed = renderer.render_frame(Image.fromarray(pixels))
+    redrawn = _redrawn_rows(output.getvalue())
+    assert 0 < changed < rows
+    assert redrawn == list(range(changed))
+    assert CLEAR_SCREEN not in output.getvalue()
+
+def test_full_redraw_when_output_size_changes():
+    renderer, output = _renderer()
+    frame = Image.fromarray(np.full((48, 64), 90, dtype=np.uint8))
+    renderer.render_frame(frame)
+    
+    renderer.width = 12
+    output.seek(0)
+    output.truncate()
+    rows = renderer.render_frame(frame)
+    assert output.getvalue().startswith(CLEAR_SCREEN)
+    assert _redrawn_rows(output.getvalue()) == list(range(rows))
+    assert all(len(line) == 12 for line in re.split(r"\033\[\d+;1H", output.getvalue().split('\033[H')[1])[1:])
+
+class CountingSource(SyntheticFrameSource):
+    """Source synthétique qui compte les images décodées et sautées."""
+    
+    def __init__(self, frame_count):
+        super().__init__(64, 48, frame_count=frame_count)
+        self.decoded = 0
+        self.skipped = 0
+    
+    def read(self):
+        frame = super().read()
+        self.decoded += frame is not None
+        return frame
+    
+    def skip(self):
+        skipped = super().skip()
+        self.skipped += skipped
+        return skipped
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Horloge simulée : le rendu d'une image dure clock.render_time secondes."""
+    clock = SimpleNamespace(now=0.0, render_time=0.0)
+    
+    def sleep(seconds):
+        clock.now += seconds
+    
+    monkeypatch.setattr(realtime, 'time', SimpleNamespace(perf_counter=lambda: clock.now, sleep=sleep))
+    return clock
+
+def test_late_frames_skipped_without_decoding_and_width_reduced(fake_clock):
+    source = CountingSource(frame_count=20)
+    renderer = RealtimeRenderer(source, width=40, fps=100, output=io.StringIO(), backend='numpy')
+    render_frame = renderer.render_frame
+    
+    def slow_render(frame):
+        fake_clock.now += fake_clock.render_time
+        return render_frame(frame)
+    
+    renderer.render_frame = slow_render
+    fake_clock.render_time = renderer.frame_budget * 2.5
+    stats = renderer.run()
+    
+    # Chaque image rendue en retard de 2,5 budgets fait sauter les 2 suivantes
+    assert stats['rendered'] == 7
+    assert stats['skipped'] == 13
+    assert source.decoded == stats['rendered']
+    assert source.skipped == stats['skipped']
+    assert stats['width_changes'] == 1
+    assert renderer.width == 36
+    assert stats['average_latency'] == pytest.approx(fake_clock.render_time)
+    assert stats['total_latency'] == pytest.approx(7 * fake_clock.render_time)
+
+def test_width_recovers_when_back_under_budget():
+    renderer, _ = _renderer(width=40, fps=100)
+    for _ in range(renderer.OVER_BUDGET_FRAMES):
+        assert renderer._adapt(renderer.frame_budget * 1.5) == 1
+    assert renderer.width == 36
+    
+    for _ in range(renderer.UNDER_BUDGET_FRAMES - 1):
+        assert renderer._adapt(0.0) == 0
+    assert renderer.width == 36
+    renderer._adapt(0.0)
+    assert renderer.width == 40
+    assert renderer.stats['width_changes'] == 2
+
+def test_no_log_lines_inside_drawn_frames(capsys, fake_clock):
+    renderer = RealtimeRenderer(SyntheticFrameSource(64, 48, frame_count=12), width=30, fps=100,
+                                backend='numpy')
+    render_frame = renderer.render_frame
+    
+    def slow_render(frame):
+        fake_clock.now += renderer.frame_budget * 1.5
+        return render_frame(frame)
+    
+    renderer.render_frame = slow_render
+    stats = renderer.run()
+    assert stats['width_changes'] == 1
+    
+    # Entre le masquage et le retour du curseur : uniquement l'image
+    drawn = capsys.readouterr().out.split(realtime.HIDE_CURSOR)[1].split(realtime.SHOW_CURSOR)[0]
+    assert drawn.startswith(CLEAR_SCREEN)
+    assert ' -- ' not in drawn
+
+def test_directory_skip_does_not_decode(tmp_path, monkeypatch):
+    for i in range(3):
+        Image.new('L', (8, 8), i * 100).save(tmp_path / f"{i}.png")
+    source = DirectoryFrameSource(str(tmp_path))
+    
+    opened = []
+    open_image = Image.open
+    monkeypatch.setattr(realtime.Image, 'open', lambda path: opened.append(path) or open_image(path))
+    assert source.skip()
+    assert np.asarray(source.read()).max() == 100
+    assert source.skip()
+    assert not source.skip()
+    assert source.read() is None
+    assert len(opened) == 1
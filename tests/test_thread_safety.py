@@ -0,0 +1,42 @@
+import threading
+import itertools
+
+from generator import ASCIIGenerator
+
+THREADS = 16
+CALLS_PER_THREAD = 30
+WIDTHS = (20, 57, 100)
+STYLES = ('standard', 'detailed', 'braille')
+
+def test_concurrent_generation_matches_sequential(image_paths):
+    cases = list(itertools.product(image_paths, WIDTHS, STYLES))
+    expected = {case: ASCIIGenerator().generate_ascii(case[0], width=case[1], ascii_chars=case[2])
+                for case in cases}
+    
+    # Un seul générateur partagé : les changements d'image entre threads
+    # remplacent l'instantané du cache en permanence
+    generator = ASCIIGenerator()
+    errors = []
+    mismatches = []
+    start = threading.Barrier(THREADS)
+    
+    def worker(index):
+        start.wait()
+        try:
+            for call in range(CALLS_PER_THREAD):
+                case = cases[(index * 7 + call) % len(cases)]
+                result = generator.generate_ascii(case[0], width=case[1], ascii_chars=case[2])
+                if result != expected[case]:
+                    mismatches.append(case)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert not errors
+    assert not mismatches
+    assert all(expected.values())
@@ -0,0 +1,70 @@
+import gzip
+import io
+
+import numpy as np
+import pytest
+
+from generator import ASCIIGenerator
+from writers import AsciiWriter, open_writer
+
+MODES = ['standard', 'blocks', 'braille']
+CHUNK_ROWS = [1, 7, 13]
+
+@pytest.fixture(scope='module')
+def generator():
+    return ASCIIGenerator()
+
+def _read(destination):
+    """Texte écrit dans une destination de test (tampon mémoire ou fichier .gz)."""
+    if isinstance(destination, io.BytesIO):
+        return destination.getvalue().decode('utf-8')
+    if isinstance(destination, io.StringIO):
+        return destination.getvalue()
+    with gzip.open(destination, 'rb') as f:
+        return f.read().decode('utf-8')
+
+@pytest.mark.parametrize('ascii_chars', MODES)
+@pytest.mark.parametrize('chunk_rows', CHUNK_ROWS)
+@pytest.mark.parametrize('kind', ['bytes', 'text', 'gzip'])
+def test_stream_matches_generate(generator, image_paths, tmp_path, ascii_chars, chunk_rows, kind):
+    expected = generator.generate_ascii(image_paths[1], width=37, ascii_chars=ascii_chars)
+    destination = {'bytes': io.BytesIO(), 'text': io.StringIO(), 'gzip': str(tmp_path / 'art.txt.gz')}[kind]
+    
+    written = generator.stream_ascii(image_paths[1], destination, width=37, ascii_chars=ascii_chars,
+                                     chunk_rows=chunk_rows)
+    
+    text = _read(destination)
+    assert text == expected
+    assert not text.endswith('\n')
+    assert written == len(expected.encode('utf-8'))
+
+def test_stdout_holds_only_the_art(generator, image_paths, capsys):
+    expected = generator.generate_ascii(image_paths[0], width=40, ascii_chars='blocks')
+    capsys.readouterr()
+    
+    written = generator.stream_ascii(image_paths[0], '-', width=40, ascii_chars='blocks', chunk_rows=5)
+    
+    captured = capsys.readouterr()
+    assert captured.out == expected
+    assert written == len(expected.encode('utf-8'))
+    # Les messages du logger restent visibles, sur stderr
+    assert "flux" in captured.err
+
+def test_writer_counts_rows_and_bytes():
+    codes = np.array([[ord('a'), 0x2588], [0x28FF, ord(' ')]], dtype=np.uint32)
+    stream = io.BytesIO()
+    
+    with AsciiWriter(stream, close_stream=False, buffer_size=4) as writer:
+        writer.write_codes(codes[:1])
+        writer.write_codes(codes[1:])
+    
+    expected = 'a█\n⣿ '.encode('utf-8')
+    assert stream.getvalue() == expected
+    assert writer.bytes_written == len(expected)
+    assert writer.rows_written == 2
+
+def test_unknown_compression(tmp_path):
+    path = tmp_path / 'art.txt'
+    with pytest.raises(ValueError):
+        open_writer(str(path), compression='bogus')
+    assert not path.exists()